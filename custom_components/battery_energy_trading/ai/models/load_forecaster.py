@@ -138,16 +138,19 @@ class LoadForecaster(BaseModel):
         # Ensure non-negative load
         return np.maximum(ensemble_pred, 0)
 
-    def predict_heat_pump_stage(self, temperature: float) -> int:
+    @classmethod
+    def predict_heat_pump_stage(cls, temperature: float) -> int:
         """Predict heat pump power stage based on temperature.
 
+        Pure function of temperature; does not require a trained model.
+
         Args:
             temperature: Outdoor temperature in Celsius
 
         Returns:
             Predicted power stage in kW (0, 3, 6, 9, 12, or 15)
         """
-        for threshold, stage in sorted(self.HEAT_PUMP_STAGES.items(), reverse=True):
+        for threshold, stage in sorted(cls.HEAT_PUMP_STAGES.items(), reverse=True):
             if temperature > threshold:
                 return stage
         return 15  # Coldest default
@@ -42,6 +42,11 @@ class SolarPredictor(BaseModel):
         self.learning_rate = learning_rate
         self._model: GradientBoostingRegressor | None = None
         self._feature_names: list[str] = []
+        # Fitted trees as flat lists, see _cache_trees()
+        self._trees: list[tuple[list[int], list[int], list[int], list[float], list[float]]] = []
+        self._baseline = 0.0
+        self._stage_weight = 0.0
+        self._n_features = 0
 
     def train(self, X: np.ndarray, y: np.ndarray) -> dict[str, float]:
         """Train the solar correction model.
@@ -67,6 +72,7 @@ class SolarPredictor(BaseModel):
 
         # Fit on full data
         self._model.fit(X, y)
+        self._cache_trees()
         self._is_trained = True
 
         # Calculate metrics
@@ -110,19 +116,94 @@ class SolarPredictor(BaseModel):
         Returns:
             Tuple of (corrected_value, correction_factor)
         """
-        if not self._is_trained:
+        if not self._is_trained or self._model is None:
             # Return original if not trained
             return forecast_value, 1.0
 
-        # Ensure 2D array
-        if features.ndim == 1:
-            features = features.reshape(1, -1)
-
-        correction = self.predict(features)[0]
+        # Single row: walk the cached trees instead of dispatching through sklearn
+        row = features[0] if features.ndim == 2 else features
+        correction = float(np.clip(self._predict_one(row), 0.5, 1.5))
         corrected = forecast_value * correction
 
         return corrected, correction
 
+    def correct_forecasts(
+        self, forecast_values: np.ndarray, features: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Apply correction to a horizon of Forecast.Solar predictions at once.
+
+        Prefer this over calling correct_forecast() per slot: the whole horizon
+        goes through a single predict() call.
+
+        Args:
+            forecast_values: Original Forecast.Solar predictions (kWh), one per row
+            features: Feature matrix, one row per prediction
+
+        Returns:
+            Tuple of (corrected_values, correction_factors)
+        """
+        forecast_values = np.asarray(forecast_values, dtype=float)
+        if not self._is_trained:
+            # Return originals if not trained
+            return forecast_values.copy(), np.ones_like(forecast_values)
+
+        corrections = self.predict(features)
+        return forecast_values * corrections, corrections
+
+    def _cache_trees(self) -> None:
+        """Cache the fitted trees as flat Python lists for single-row prediction."""
+        model = self._model
+        if model is None:
+            return
+
+        self._n_features = model.n_features_in_
+        self._stage_weight = float(model.learning_rate)
+        self._baseline = float(model.init_.predict(np.zeros((1, model.n_features_in_)))[0])
+        self._trees = [
+            (
+                tree.children_left.tolist(),
+                tree.children_right.tolist(),
+                tree.feature.tolist(),
+                tree.threshold.tolist(),
+                tree.value[:, 0, 0].tolist(),
+            )
+            for tree in (stage[0].tree_ for stage in model.estimators_)
+        ]
+
+    def _predict_one(self, row: np.ndarray) -> float:
+        """Predict the raw correction factor for a single feature row.
+
+        Gives the same result as ``GradientBoostingRegressor.predict`` (features are
+        compared as float32 like sklearn's trees and stages are summed in the same
+        order) without its dispatch overhead. The row is validated like ``predict``.
+
+        Args:
+            row: 1D feature vector
+
+        Returns:
+            Unclipped correction factor
+
+        Raises:
+            ValueError: If the row has the wrong number of features or is not finite
+        """
+        x = np.asarray(row, dtype=np.float32)
+        if x.shape[-1] != self._n_features:
+            raise ValueError(
+                f"X has {x.shape[-1]} features, but {self.name} is expecting "
+                f"{self._n_features} features as input."
+            )
+        if not np.isfinite(x).all():
+            raise ValueError("Input X contains NaN or infinity.")
+
+        values = x.tolist()
+        value = self._baseline
+        for left, right, feature, threshold, leaf_value in self._trees:
+            node = 0
+            while left[node] != -1:
+                node = left[node] if values[feature[node]] <= threshold[node] else right[node]
+            value += self._stage_weight * leaf_value[node]
+        return value
+
     def save(self, path: Path) -> None:
         """Save model to disk.
 
@@ -168,6 +249,7 @@ class SolarPredictor(BaseModel):
         self.max_depth = data["max_depth"]
         self.learning_rate = data["learning_rate"]
         self._feature_names = data.get("feature_names", [])
+        self._cache_trees()
         self._is_trained = True
 
         _LOGGER.info("Loaded solar predictor from %s", model_path)
@@ -6,6 +6,7 @@ import hashlib
 import json
 import logging
 from datetime import datetime, timedelta
+from itertools import pairwise
 from typing import Any
 
 
@@ -69,6 +70,10 @@ class EnergyOptimizer:
         self._cache[cache_key] = (datetime.now(), result)
         _LOGGER.debug("Cached result for key %s (cache size: %d)", cache_key[:8], len(self._cache))
 
+    def clear_cache(self) -> None:
+        """Drop all cached slot selections."""
+        self._cache.clear()
+
     @staticmethod
     def _validate_inputs(
         battery_capacity: float,
@@ -841,33 +846,41 @@ class EnergyOptimizer:
         charge_energy_per_slot = charge_rate * slot_duration_hours
         discharge_energy_per_slot = discharge_rate * slot_duration_hours  # noqa: F841
 
+        # Read each price once instead of looking it up in the slot dicts
+        # inside the nested loop below
+        values = [slot["value"] for slot in raw_prices]
+        slot_count = len(values)
+
+        # Charge window length only depends on capacity and rate
+        charge_slots_needed = max(1, int(battery_capacity / charge_energy_per_slot))
+
         # Find charging windows and matching discharge windows
-        for charge_start_idx in range(len(raw_prices) - 2):
+        for charge_start_idx in range(slot_count - 2):
             # Calculate charge window (could be multiple consecutive slots)
-            charge_slots_needed = max(1, int(battery_capacity / charge_energy_per_slot))
-            charge_end_idx = min(charge_start_idx + charge_slots_needed, len(raw_prices))
+            charge_end_idx = min(charge_start_idx + charge_slots_needed, slot_count)
+            charge_window_len = charge_end_idx - charge_start_idx
 
             # Calculate average charge price
-            charge_window = raw_prices[charge_start_idx:charge_end_idx]
-            avg_charge_price = sum(s["value"] for s in charge_window) / len(charge_window)
+            avg_charge_price = sum(values[charge_start_idx:charge_end_idx]) / charge_window_len
+
+            # Energy and cost only depend on the charge window
+            energy_charged = min(battery_capacity, charge_energy_per_slot * charge_window_len)
+            energy_discharged = energy_charged * efficiency
+            charge_cost = energy_charged * avg_charge_price
 
             # Look for discharge opportunities after charging window
-            for discharge_idx in range(charge_end_idx + 1, len(raw_prices)):
-                discharge_price = raw_prices[discharge_idx]["value"]
+            for discharge_idx in range(charge_end_idx + 1, slot_count):
+                discharge_price = values[discharge_idx]
 
                 # Calculate profit considering efficiency
-                energy_charged = min(battery_capacity, charge_energy_per_slot * len(charge_window))
-                energy_discharged = energy_charged * efficiency
-
-                charge_cost = energy_charged * avg_charge_price
                 discharge_revenue = energy_discharged * discharge_price
                 profit = discharge_revenue - charge_cost
 
                 if profit >= min_profit_threshold:
                     opportunities.append(
                         {
-                            "charge_start": charge_window[0]["start"],
-                            "charge_end": charge_window[-1]["end"],
+                            "charge_start": raw_prices[charge_start_idx]["start"],
+                            "charge_end": raw_prices[charge_end_idx - 1]["end"],
                             "charge_price": avg_charge_price,
                             "discharge_start": raw_prices[discharge_idx]["start"],
                             "discharge_end": raw_prices[discharge_idx]["end"],
@@ -945,30 +958,20 @@ class EnergyOptimizer:
         # Sort by start time to ensure consecutive detection works
         sorted_slots = sorted(slots, key=lambda x: x["start"])
 
-        combined = []
-        current_group = [sorted_slots[0]]
-
-        for slot in sorted_slots[1:]:
-            # Check if this slot is consecutive with the previous one
-            last_slot = current_group[-1]
-
-            # Slots are consecutive if the end time of the last slot equals the start time of this slot
-            if last_slot["end"] == slot["start"]:
-                current_group.append(slot)
-            else:
-                # Not consecutive - finalize the current group and start a new one
-                combined.append(
-                    _merge_slot_group(
-                        current_group, min_battery_reserve_percent, battery_capacity_kwh
-                    )
-                )
-                current_group = [slot]
-
-        # Don't forget the last group
-        if current_group:
-            combined.append(
-                _merge_slot_group(current_group, min_battery_reserve_percent, battery_capacity_kwh)
+        # Slots are consecutive if the end time of one equals the start time of the
+        # next, so a new group starts wherever that does not hold. The times are read
+        # into flat lists once rather than looked up in the slot dicts per comparison.
+        starts = [slot["start"] for slot in sorted_slots]
+        ends = [slot["end"] for slot in sorted_slots]
+        group_starts = [idx for idx in range(1, len(sorted_slots)) if ends[idx - 1] != starts[idx]]
+        bounds = [0, *group_starts, len(sorted_slots)]
+
+        combined = [
+            _merge_slot_group(
+                sorted_slots[lo:hi], min_battery_reserve_percent, battery_capacity_kwh
             )
+            for lo, hi in pairwise(bounds)
+        ]
 
         _LOGGER.info(
             "Combined %d individual slots into %d consecutive discharge periods (min reserve: %.0f%%)",
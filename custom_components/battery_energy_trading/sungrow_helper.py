@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 
@@ -78,6 +79,38 @@ SUNGROW_ENTITY_PATTERNS = {
     ],
 }
 
+# All patterns compiled into one alternation with a named group per entity type, so
+# each entity ID is matched once and ``lastgroup`` names its type. The types' patterns
+# are disjoint (each type has its own suffixes), so an ID matches at most one type.
+_ENTITY_TYPE_RE = re.compile(
+    "|".join(
+        f"(?P<{entity_type}>" + "|".join(f"(?:{pattern})" for pattern in patterns) + ")"
+        for entity_type, patterns in SUNGROW_ENTITY_PATTERNS.items()
+    )
+)
+
+# Model name embedded in an entity ID (e.g. sensor.sh10rt_battery_level)
+_MODEL_IN_ENTITY_ID_RE = re.compile(r"sh\d+\.?\d*rt")
+
+
+@lru_cache(maxsize=32)
+def _lookup_inverter_specs(model_name: str) -> dict[str, float] | None:
+    """Look up specs for a normalized (upper-cased, stripped) model name.
+
+    Cached because the same model is looked up on every auto-configuration.
+    """
+    # Try exact match first
+    if model_name in SUNGROW_INVERTER_SPECS:
+        return SUNGROW_INVERTER_SPECS[model_name]
+
+    # Try fuzzy match (e.g., extract "SH10RT" from "SH10RT V1.1.2")
+    for known_model in SUNGROW_INVERTER_SPECS:
+        if known_model in model_name:
+            return SUNGROW_INVERTER_SPECS[known_model]
+
+    _LOGGER.warning("Unknown Sungrow inverter model: %s", model_name)
+    return None
+
 
 class SungrowHelper:
     """Helper class for Sungrow integration auto-detection."""
@@ -93,7 +126,7 @@ class SungrowHelper:
         Returns:
             Dictionary with detected entity IDs for battery_level, battery_capacity, and solar_power
         """
-        detected = {
+        detected: dict[str, str | None] = {
             "battery_level": None,
             "battery_capacity": None,
             "solar_power": None,
@@ -101,24 +134,24 @@ class SungrowHelper:
         }
 
         all_entities = self.hass.states.async_all()
+        remaining = len(detected)
 
-        for entity_type, patterns in SUNGROW_ENTITY_PATTERNS.items():
-            for entity in all_entities:
-                entity_id = entity.entity_id.lower()
-
-                # Check if entity matches any pattern
-                for pattern in patterns:
-                    if re.match(pattern, entity_id):
-                        detected[entity_type] = entity.entity_id
-                        _LOGGER.info(
-                            "Auto-detected Sungrow %s entity: %s",
-                            entity_type,
-                            entity.entity_id,
-                        )
-                        break
-
-                if detected[entity_type]:
-                    break
+        for entity in all_entities:
+            match = _ENTITY_TYPE_RE.match(entity.entity_id.lower())
+            entity_type = match.lastgroup if match is not None else None
+            if entity_type is None or detected[entity_type] is not None:
+                continue
+
+            # First matching entity wins for each type
+            detected[entity_type] = entity.entity_id
+            _LOGGER.info(
+                "Auto-detected Sungrow %s entity: %s",
+                entity_type,
+                entity.entity_id,
+            )
+            remaining -= 1
+            if not remaining:
+                break
 
         return detected
 
@@ -135,20 +168,7 @@ class SungrowHelper:
         if not model_name:
             return None
 
-        # Normalize model name
-        model_name = model_name.upper().strip()
-
-        # Try exact match first
-        if model_name in SUNGROW_INVERTER_SPECS:
-            return SUNGROW_INVERTER_SPECS[model_name]
-
-        # Try fuzzy match (e.g., extract "SH10RT" from "SH10RT V1.1.2")
-        for known_model in SUNGROW_INVERTER_SPECS:
-            if known_model in model_name:
-                return SUNGROW_INVERTER_SPECS[known_model]
-
-        _LOGGER.warning("Unknown Sungrow inverter model: %s", model_name)
-        return None
+        return _lookup_inverter_specs(model_name.upper().strip())
 
     def detect_inverter_model_from_entities(self) -> str | None:
         """
@@ -181,7 +201,7 @@ class SungrowHelper:
                                 return model
 
             # Try to extract model from entity ID (e.g., sensor.sh10rt_battery_level)
-            match = re.search(r"sh\d+\.?\d*rt", entity_id)
+            match = _MODEL_IN_ENTITY_ID_RE.search(entity_id)
             if match:
                 model = match.group(0).upper().replace(".", "")
                 return model
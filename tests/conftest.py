@@ -1,10 +1,60 @@
 """Pytest configuration and fixtures for Battery Energy Trading tests."""
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from unittest.mock import Mock, MagicMock, create_autospec
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from custom_components.battery_energy_trading.energy_optimizer import EnergyOptimizer
+
+# Import the platform modules up front so each xdist worker pays the import
+# cost once during conftest loading rather than inside the first test module
+import custom_components.battery_energy_trading.number  # noqa: F401
+
+from .helpers import (
+    MOCK_CONFIG_ENTRY_DATA,
+    MOCK_SUNGROW_ENTRY_DATA,
+    MOCK_SUNGROW_ENTRY_OPTIONS,
+    NORD_POOL_RAW_TODAY,
+    SUNGROW_ENTITIES,
+    FakeState,
+    constant_price_slots,
+    make_states,
+    reset_config_entry,
+)
+
+
+class CallRec:
+    """Minimal call recorder for callbacks whose calls are only counted or inspected.
+
+    Much cheaper to build than ``Mock()`` and supports the subset of its API the
+    tests use: ``called``, ``call_args``, ``assert_called_once()`` and
+    ``assert_not_called()``.
+    """
+
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+    @property
+    def called(self):
+        return bool(self.calls)
+
+    @property
+    def call_args(self):
+        return self.calls[-1] if self.calls else None
+
+    def assert_called_once(self):
+        assert len(self.calls) == 1, f"Expected 1 call, got {len(self.calls)}"
+
+    def assert_not_called(self):
+        assert not self.calls, f"Expected no calls, got {len(self.calls)}"
+
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
@@ -13,8 +63,13 @@ def auto_enable_custom_integrations(enable_custom_integrations):
 
 
 @pytest.fixture
-def mock_hass():
-    """Mock Home Assistant instance with proper setup."""
+def async_add_entities():
+    """Recorder for the AddEntitiesCallback passed to platform setup."""
+    return CallRec()
+
+
+def _make_mock_hass():
+    """Build a mock Home Assistant instance with proper setup."""
     hass = MagicMock(spec=HomeAssistant)
     hass.data = {}  # Use real dict instead of MagicMock
     hass.states = MagicMock()
@@ -26,6 +81,22 @@ def mock_hass():
     return hass
 
 
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant instance with proper setup."""
+    return _make_mock_hass()
+
+
+@pytest.fixture(scope="module")
+def module_hass():
+    """Mock Home Assistant instance shared by a test module.
+
+    Backs module-scoped entity fixtures. Modules using it override ``mock_hass``
+    to hand this instance out with per-test state restored via ``monkeypatch``.
+    """
+    return _make_mock_hass()
+
+
 @pytest.fixture
 def mock_hass_with_nordpool(mock_hass, mock_nord_pool_state):
     """Mock Home Assistant instance with Nord Pool integration."""
@@ -33,12 +104,7 @@ def mock_hass_with_nordpool(mock_hass, mock_nord_pool_state):
     mock_hass.states.async_all = Mock(return_value=[mock_nord_pool_state])
 
     # Make states.get return Nord Pool entity when queried
-    def get_state(entity_id):
-        if entity_id == mock_nord_pool_state.entity_id:
-            return mock_nord_pool_state
-        return None
-
-    mock_hass.states.get = Mock(side_effect=get_state)
+    mock_hass.states.get = make_states({mock_nord_pool_state.entity_id: mock_nord_pool_state})
     return mock_hass
 
 
@@ -46,55 +112,57 @@ def mock_hass_with_nordpool(mock_hass, mock_nord_pool_state):
 def mock_hass_with_nordpool_and_sungrow(mock_hass, mock_nord_pool_state, mock_sungrow_entities):
     """Mock Home Assistant instance with both Nord Pool and Sungrow integrations."""
     # Combine Nord Pool and Sungrow entities
-    all_entities = [mock_nord_pool_state] + mock_sungrow_entities
+    all_entities = [mock_nord_pool_state, *mock_sungrow_entities]
     mock_hass.states.async_all = Mock(return_value=all_entities)
 
     # Make states.get return correct entity when queried
-    def get_state(entity_id):
-        if entity_id == mock_nord_pool_state.entity_id:
-            return mock_nord_pool_state
-        for entity in mock_sungrow_entities:
-            if entity.entity_id == entity_id:
-                return entity
-        return None
-
-    mock_hass.states.get = Mock(side_effect=get_state)
+    mock_hass.states.get = make_states({entity.entity_id: entity for entity in all_entities})
     return mock_hass
 
 
+@pytest.fixture(scope="session")
+def session_config_entry():
+    """Config entry mock shared by the whole session.
+
+    Safe for broader-scoped fixtures that only read ``entry_id``/``data``/``options``;
+    tests that mutate the entry should request ``mock_config_entry`` instead.
+    """
+    return reset_config_entry(
+        create_autospec(ConfigEntry, instance=True),
+        "test_entry_id",
+        MOCK_CONFIG_ENTRY_DATA,
+        {},
+    )
+
+
+@pytest.fixture(scope="session")
+def session_config_entry_sungrow():
+    """Sungrow config entry mock shared by the whole session (read-only use)."""
+    return reset_config_entry(
+        create_autospec(ConfigEntry, instance=True),
+        "test_sungrow_entry",
+        MOCK_SUNGROW_ENTRY_DATA,
+        MOCK_SUNGROW_ENTRY_OPTIONS,
+    )
+
+
 @pytest.fixture
-def mock_config_entry():
-    """Mock config entry."""
-    entry = MagicMock()
-    entry.entry_id = "test_entry_id"
-    entry.data = {
-        "nordpool_entity": "sensor.nordpool_kwh_ee_eur_3_10_022",
-        "battery_level_entity": "sensor.battery_level",
-        "battery_capacity_entity": "sensor.battery_capacity",
-        "solar_power_entity": "sensor.solar_power",
-    }
-    entry.options = {}
-    return entry
+def mock_config_entry(session_config_entry):
+    """Mock config entry (the session entry, reset to defaults for each test)."""
+    return reset_config_entry(
+        session_config_entry, "test_entry_id", MOCK_CONFIG_ENTRY_DATA, {}
+    )
 
 
 @pytest.fixture
-def mock_config_entry_sungrow():
+def mock_config_entry_sungrow(session_config_entry_sungrow):
     """Mock config entry with Sungrow auto-detection."""
-    entry = MagicMock()
-    entry.entry_id = "test_sungrow_entry"
-    entry.data = {
-        "nordpool_entity": "sensor.nordpool_kwh_ee_eur_3_10_022",
-        "battery_level_entity": "sensor.sungrow_battery_level",
-        "battery_capacity_entity": "sensor.sungrow_battery_capacity",
-        "solar_power_entity": "sensor.sungrow_pv_power",
-    }
-    entry.options = {
-        "charge_rate": 10.0,
-        "discharge_rate": 10.0,
-        "inverter_model": "SH10RT",
-        "auto_detected": True,
-    }
-    return entry
+    return reset_config_entry(
+        session_config_entry_sungrow,
+        "test_sungrow_entry",
+        MOCK_SUNGROW_ENTRY_DATA,
+        MOCK_SUNGROW_ENTRY_OPTIONS,
+    )
 
 
 @pytest.fixture
@@ -128,32 +196,31 @@ def sample_price_data():
     return prices
 
 
-@pytest.fixture
-def mock_sungrow_entities():
-    """Mock Sungrow Modbus entities (matching actual integration entity names)."""
-    # Actual Sungrow Modbus entities don't have "sungrow_" prefix
-    # They are named based on their function: battery_level, battery_capacity, total_dc_power
-    battery_level = MagicMock()
-    battery_level.entity_id = "sensor.battery_level"  # sg_battery_level (address 13022)
-    battery_level.state = "75"
-    battery_level.attributes = {}
+# 96 15-minute slots at one constant price, built once at import. Kept as a
+# list because the optimizer concatenates raw_today with raw_tomorrow.
+FLAT_PRICE_DATA = constant_price_slots("2025-10-01T00:00", 96, 15, 0.15)
 
-    battery_capacity = MagicMock()
-    battery_capacity.entity_id = "sensor.battery_capacity"  # sg_battery_capacity (address 5638)
-    battery_capacity.state = "12.8"
-    battery_capacity.attributes = {}
 
-    solar_power = MagicMock()
-    solar_power.entity_id = "sensor.total_dc_power"  # sg_total_dc_power (address 5016)
-    solar_power.state = "2500"
-    solar_power.attributes = {}
+@pytest.fixture(scope="session")
+def flat_price_data():
+    """96 15-minute slots at one constant price (shared, treat as read-only)."""
+    return FLAT_PRICE_DATA
 
-    device_type = MagicMock()
-    device_type.entity_id = "sensor.sungrow_device_type"  # Template sensor based on device_type_code
-    device_type.state = "SH10RT"
-    device_type.attributes = {}
 
-    return [battery_level, battery_capacity, solar_power, device_type]
+@pytest.fixture(scope="session")
+def mock_nordpool_flat(flat_price_data):
+    """Nord Pool state with flat prices, so no arbitrage is possible (read-only)."""
+    return FakeState(attributes={"raw_today": flat_price_data})
+
+
+@pytest.fixture(scope="session")
+def mock_sungrow_entities():
+    """Mock Sungrow Modbus entities (matching actual integration entity names).
+
+    Built once per session; the tuple is read-only, so tests that need a
+    different entity set build their own list.
+    """
+    return SUNGROW_ENTITIES
 
 
 @pytest.fixture
@@ -162,33 +229,8 @@ def mock_nord_pool_state():
     state = MagicMock()
     state.state = "0.15"
     state.entity_id = "sensor.nordpool_kwh_ee_eur_3_10_022"
-
-    # Create realistic raw_today data
-    base_time = datetime(2025, 10, 2, 0, 0, 0)
-    raw_today = []
-    for hour in range(24):
-        for quarter in range(4):
-            start = base_time + timedelta(hours=hour, minutes=quarter * 15)
-            end = start + timedelta(minutes=15)
-
-            # Realistic Estonian pricing pattern
-            if 8 <= hour < 10:  # Morning peak
-                price = 0.35 + (quarter * 0.02)
-            elif 17 <= hour < 20:  # Evening peak
-                price = 0.40 + (quarter * 0.03)
-            elif 2 <= hour < 5:  # Night cheap
-                price = 0.02 + (quarter * 0.01)
-            else:  # Normal hours
-                price = 0.12 + (quarter * 0.01)
-
-            raw_today.append({
-                "start": start,
-                "end": end,
-                "value": price,
-            })
-
     state.attributes = {
-        "raw_today": raw_today,
+        "raw_today": NORD_POOL_RAW_TODAY,
         "raw_tomorrow": [],  # Populated after 13:00 CET
         "unit": "EUR/kWh",
         "currency": "EUR",
@@ -197,9 +239,8 @@ def mock_nord_pool_state():
     return state
 
 
-@pytest.fixture
-def mock_coordinator():
-    """Mock DataUpdateCoordinator."""
+def _make_mock_data_coordinator():
+    """Build a mock DataUpdateCoordinator."""
     coordinator = MagicMock()
     coordinator.data = {
         "raw_today": [],
@@ -211,37 +252,48 @@ def mock_coordinator():
     return coordinator
 
 
+@pytest.fixture
+def mock_coordinator():
+    """Mock DataUpdateCoordinator."""
+    return _make_mock_data_coordinator()
+
+
+@pytest.fixture(scope="module")
+def module_coordinator():
+    """Mock DataUpdateCoordinator shared by a test module (read-only use)."""
+    return _make_mock_data_coordinator()
+
+
+@pytest.fixture(scope="session")
+def optimizer():
+    """Energy optimizer shared by the whole session.
+
+    The optimizer memoizes slot selections, so modules sharing it must call
+    ``optimizer.clear_cache()`` between tests.
+    """
+    return EnergyOptimizer()
+
+
 @pytest.fixture
 def mock_battery_states(mock_hass):
     """Mock battery-related sensor states."""
     # Battery level sensor
-    battery_level = MagicMock()
-    battery_level.state = "75"
-    battery_level.entity_id = "sensor.battery_level"
-    battery_level.attributes = {"unit_of_measurement": "%"}
+    battery_level = FakeState("sensor.battery_level", "75", {"unit_of_measurement": "%"})
 
     # Battery capacity sensor
-    battery_capacity = MagicMock()
-    battery_capacity.state = "12.8"
-    battery_capacity.entity_id = "sensor.battery_capacity"
-    battery_capacity.attributes = {"unit_of_measurement": "kWh"}
+    battery_capacity = FakeState("sensor.battery_capacity", "12.8", {"unit_of_measurement": "kWh"})
 
     # Solar power sensor
-    solar_power = MagicMock()
-    solar_power.state = "2500"
-    solar_power.entity_id = "sensor.solar_power"
-    solar_power.attributes = {"unit_of_measurement": "W"}
+    solar_power = FakeState("sensor.solar_power", "2500", {"unit_of_measurement": "W"})
 
     # Configure mock_hass states
-    def get_state(entity_id):
-        states_map = {
+    mock_hass.states.get = make_states(
+        {
             "sensor.battery_level": battery_level,
             "sensor.battery_capacity": battery_capacity,
             "sensor.solar_power": solar_power,
         }
-        return states_map.get(entity_id)
-
-    mock_hass.states.get = Mock(side_effect=get_state)
+    )
 
     return {
         "battery_level": battery_level,
@@ -1,11 +1,6 @@
 """Tests for config flow."""
 import pytest
 from unittest.mock import Mock, MagicMock, patch, AsyncMock
-import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from custom_components.battery_energy_trading.config_flow import ConfigFlow
 from custom_components.battery_energy_trading.const import (
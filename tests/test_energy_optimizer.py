@@ -1,14 +1,8 @@
 """Tests for energy optimizer module."""
 import pytest
 from datetime import datetime, timedelta
-import sys
-from pathlib import Path
 
-# Add custom_components directory to path for direct module import
-# This avoids importing __init__.py which requires homeassistant
-sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "battery_energy_trading"))
-
-from energy_optimizer import EnergyOptimizer
+from custom_components.battery_energy_trading.energy_optimizer import EnergyOptimizer
 
 
 class TestEnergyOptimizer:
@@ -850,6 +844,22 @@ class TestInputValidation:
         # Cache should be empty after cleanup
         assert len(optimizer._cache) == 0
 
+    def test_clear_cache(self, sample_price_data):
+        """Test that clear_cache drops all cached selections."""
+        optimizer = EnergyOptimizer()
+        optimizer.select_discharge_slots(
+            raw_prices=sample_price_data,
+            min_sell_price=0.30,
+            battery_capacity=10.0,
+            battery_level=80.0,
+            discharge_rate=5.0,
+        )
+        assert optimizer._cache
+
+        optimizer.clear_cache()
+
+        assert optimizer._cache == {}
+
     def test_solar_forecast_with_invalid_datetime_keys(self, sample_price_data):
         """Test handling of solar forecast with malformed datetime keys."""
         optimizer = EnergyOptimizer()
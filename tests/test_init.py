@@ -1,10 +1,8 @@
 """Tests for __init__.py integration setup."""
-import inspect
 import pytest
 from unittest.mock import Mock, MagicMock, AsyncMock, patch
 
 from homeassistant.const import Platform
-from homeassistant.core import ServiceCall
 
 from custom_components.battery_energy_trading import (
     async_setup,
@@ -15,16 +13,7 @@ from custom_components.battery_energy_trading import (
     SERVICE_SYNC_SUNGROW_PARAMS,
 )
 
-
-def create_service_call(hass, domain, service, data):
-    """Create ServiceCall with backward compatibility for different HA versions."""
-    # Check if ServiceCall accepts hass parameter (HA 2025.10+)
-    sig = inspect.signature(ServiceCall.__init__)
-    if 'hass' in sig.parameters:
-        return ServiceCall(hass=hass, domain=domain, service=service, data=data)
-    else:
-        # Older versions don't require hass
-        return ServiceCall(domain=domain, service=service, data=data)
+from .helpers import create_service_call, make_coordinator_mock
 
 
 @pytest.mark.asyncio
@@ -45,10 +34,7 @@ async def test_async_setup(mock_hass):
 @patch("custom_components.battery_energy_trading.BatteryEnergyTradingCoordinator")
 async def test_async_setup_entry(mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry):
     """Test async_setup_entry forwards platforms."""
-    # Mock coordinator instance
-    mock_coordinator = MagicMock()
-    mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-    mock_coordinator_class.return_value = mock_coordinator
+    mock_coordinator_class.return_value = make_coordinator_mock()
 
     mock_hass_with_nordpool.config_entries.async_forward_entry_setups = AsyncMock()
 
@@ -73,10 +59,7 @@ async def test_async_setup_entry_initializes_domain_data(
     mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry
 ):
     """Test async_setup_entry initializes domain data if not present."""
-    # Mock coordinator instance
-    mock_coordinator = MagicMock()
-    mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-    mock_coordinator_class.return_value = mock_coordinator
+    mock_coordinator_class.return_value = make_coordinator_mock()
 
     # Ensure domain data not already set
     mock_hass_with_nordpool.data = {}
@@ -95,10 +78,7 @@ async def test_async_setup_entry_initializes_ai_trainer(
     mock_coordinator_class, mock_ai_trainer_class, mock_hass_with_nordpool, mock_config_entry
 ):
     """Test async_setup_entry initializes AI trainer."""
-    # Mock coordinator instance
-    mock_coordinator = MagicMock()
-    mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-    mock_coordinator_class.return_value = mock_coordinator
+    mock_coordinator_class.return_value = make_coordinator_mock()
 
     # Mock AI trainer instance
     mock_ai_trainer = MagicMock()
@@ -227,8 +207,7 @@ class TestSyncSungrowParamsService:
 
             # Call service
             call = create_service_call(
-                mock_hass, DOMAIN, SERVICE_SYNC_SUNGROW_PARAMS,
-                {"entry_id": "test_sungrow_entry"}
+                SERVICE_SYNC_SUNGROW_PARAMS, {"entry_id": "test_sungrow_entry"}
             )
             await service_handler(call)
 
@@ -284,7 +263,7 @@ class TestSyncSungrowParamsService:
             )
 
             # Call service without entry_id
-            call = create_service_call(mock_hass, DOMAIN, SERVICE_SYNC_SUNGROW_PARAMS, {})
+            call = create_service_call(SERVICE_SYNC_SUNGROW_PARAMS, {})
             await service_handler(call)
 
             # Should have found and updated the auto-detected entry
@@ -310,7 +289,7 @@ class TestSyncSungrowParamsService:
         mock_hass.config_entries.async_entries = Mock(return_value=[mock_config_entry])
 
         # Call service without entry_id
-        call = create_service_call(mock_hass, DOMAIN, SERVICE_SYNC_SUNGROW_PARAMS, {})
+        call = create_service_call(SERVICE_SYNC_SUNGROW_PARAMS, {})
         await service_handler(call)
 
         # Should not try to update entry (logs error instead)
@@ -335,9 +314,7 @@ class TestSyncSungrowParamsService:
         mock_hass.config_entries.async_get_entry = Mock(return_value=None)
 
         # Call service with non-existent entry_id
-        call = create_service_call(
-            mock_hass, DOMAIN, SERVICE_SYNC_SUNGROW_PARAMS, {"entry_id": "non_existent"}
-        )
+        call = create_service_call(SERVICE_SYNC_SUNGROW_PARAMS, {"entry_id": "non_existent"})
         await service_handler(call)
 
         # Should log error but not raise exception
@@ -388,8 +365,7 @@ class TestSyncSungrowParamsService:
             )
 
             call = create_service_call(
-                mock_hass, DOMAIN, SERVICE_SYNC_SUNGROW_PARAMS,
-                {"entry_id": "test_sungrow_entry"}
+                SERVICE_SYNC_SUNGROW_PARAMS, {"entry_id": "test_sungrow_entry"}
             )
             await service_handler(call)
 
@@ -408,10 +384,7 @@ class TestDomainData:
         self, mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry
     ):
         """Test domain data has correct structure."""
-        # Mock coordinator instance
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
+        mock_coordinator_class.return_value = make_coordinator_mock()
 
         mock_hass_with_nordpool.config_entries.async_forward_entry_setups = AsyncMock()
 
@@ -433,10 +406,7 @@ class TestDomainData:
         mock_config_entry_sungrow,
     ):
         """Test multiple config entries are stored separately."""
-        # Mock coordinator instance
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
+        mock_coordinator_class.return_value = make_coordinator_mock()
 
         mock_hass_with_nordpool_and_sungrow.config_entries.async_forward_entry_setups = AsyncMock()
 
@@ -463,10 +433,7 @@ class TestAutomationServices:
         self, mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry
     ):
         """Test generate_automation_scripts service."""
-        # Mock coordinator instance
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
+        mock_coordinator_class.return_value = make_coordinator_mock()
 
         mock_hass_with_nordpool.config_entries.async_forward_entry_setups = AsyncMock()
 
@@ -497,10 +464,7 @@ class TestIntegrationLifecycle:
         self, mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry
     ):
         """Test full setup and unload cycle."""
-        # Mock coordinator instance
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
+        mock_coordinator_class.return_value = make_coordinator_mock()
 
         mock_hass_with_nordpool.config_entries.async_forward_entry_setups = AsyncMock()
         mock_hass_with_nordpool.config_entries.async_unload_platforms = AsyncMock(return_value=True)
@@ -521,10 +485,7 @@ class TestIntegrationLifecycle:
         self, mock_coordinator_class, mock_hass_with_nordpool, mock_config_entry
     ):
         """Test async_setup_entry works without prior async_setup call."""
-        # Mock coordinator instance
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
+        mock_coordinator_class.return_value = make_coordinator_mock()
 
         # Don't call async_setup first
         mock_hass_with_nordpool.data = {}  # Empty hass data
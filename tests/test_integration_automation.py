@@ -2,21 +2,62 @@
 
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, AsyncMock, patch
+from unittest.mock import MagicMock, patch
 
 from homeassistant.core import HomeAssistant
 
 from custom_components.battery_energy_trading import (
     async_setup,
-    async_setup_entry,
     DOMAIN,
 )
 from custom_components.battery_energy_trading.coordinator import (
     BatteryEnergyTradingCoordinator,
 )
 
+from .helpers import bootstrapped_entry, create_service_call, make_states
+
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.xdist_group("integration")]
+
+# Automation state transitions seen by the automation status sensor:
+# (record_action args, or None to clear, expected sensor state, expected automation_active)
+AUTOMATION_TRANSITIONS = [
+    (("discharge", "2025-10-31T16:00:00", None), "Active - Discharging", True),
+    (None, "Idle", False),
+    (("charge", None, "2025-11-01T03:00:00"), "Active - Charging", True),
+]
+
+# Action tracking fields of coordinator.data before any action is recorded
+IDLE_AUTOMATION_DATA = {
+    "last_action": None,
+    "last_action_time": None,
+    "automation_active": False,
+    "next_discharge_slot": None,
+    "next_charge_slot": None,
+}
+
+
+def _apply_transition(coordinator, action_args):
+    """Set the action tracking fields of coordinator.data for one transition.
+
+    Mirrors what record_action()/clear_action() followed by a refresh would
+    publish; the real path is covered by test_end_to_end_automation_monitoring_flow.
+    """
+    data = dict(coordinator.data)
+    if action_args:
+        action, next_discharge_slot, next_charge_slot = action_args
+        data.update(
+            last_action=action,
+            last_action_time=datetime(2025, 10, 31, 15, 0).isoformat(),
+            automation_active=True,
+            next_discharge_slot=next_discharge_slot,
+            next_charge_slot=next_charge_slot,
+        )
+    else:
+        data["automation_active"] = False
+    coordinator.data = data
+
 
-@pytest.mark.asyncio
 async def test_full_setup_and_service_flow(mock_hass, mock_config_entry):
     """Test complete setup flow: async_setup → async_setup_entry → service calls."""
     # Step 1: Setup integration (registers services)
@@ -33,18 +74,7 @@ async def test_full_setup_and_service_flow(mock_hass, mock_config_entry):
     assert "force_refresh" in registered_services
 
     # Step 2: Setup config entry (creates coordinator and entities)
-    with patch(
-        "custom_components.battery_energy_trading.BatteryEnergyTradingCoordinator"
-    ) as mock_coordinator_class:
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
-
-        mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
-
-        result = await async_setup_entry(mock_hass, mock_config_entry)
-        assert result is True
-
+    async with bootstrapped_entry(mock_hass, mock_config_entry) as mock_coordinator:
         # Verify coordinator was created and stored
         assert mock_config_entry.entry_id in mock_hass.data[DOMAIN]
         assert "coordinator" in mock_hass.data[DOMAIN][mock_config_entry.entry_id]
@@ -58,27 +88,10 @@ async def test_full_setup_and_service_flow(mock_hass, mock_config_entry):
 
     assert force_refresh_handler is not None
 
-    # Make async_request_refresh an AsyncMock
-    mock_coordinator.async_request_refresh = AsyncMock()
-
-    # Create service call mock
-    from homeassistant.core import ServiceCall
-    import inspect
-
-    sig = inspect.signature(ServiceCall.__init__)
-    if "hass" in sig.parameters:
-        service_call = ServiceCall(
-            hass=mock_hass,
-            domain=DOMAIN,
-            service="force_refresh",
-            data={"config_entry_id": mock_config_entry.entry_id},
-        )
-    else:
-        service_call = ServiceCall(
-            domain=DOMAIN,
-            service="force_refresh",
-            data={"config_entry_id": mock_config_entry.entry_id},
-        )
+    # Create service call
+    service_call = create_service_call(
+        "force_refresh", {"config_entry_id": mock_config_entry.entry_id}
+    )
 
     # Call service
     await force_refresh_handler(service_call)
@@ -87,10 +100,9 @@ async def test_full_setup_and_service_flow(mock_hass, mock_config_entry):
     mock_coordinator.async_request_refresh.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_coordinator_action_tracking_flow(mock_hass, mock_nord_pool_state):
     """Test coordinator action tracking updates automation status sensor."""
-    mock_hass.states.get = MagicMock(return_value=mock_nord_pool_state)
+    mock_hass.states.get = make_states({"sensor.nordpool_test": mock_nord_pool_state})
 
     # Create coordinator
     coordinator = BatteryEnergyTradingCoordinator(mock_hass, "sensor.nordpool_test")
@@ -123,15 +135,12 @@ async def test_coordinator_action_tracking_flow(mock_hass, mock_nord_pool_state)
     # last_action and timestamps persist after clear
 
 
-@pytest.mark.asyncio
 async def test_automation_status_sensor_responds_to_coordinator(
-    mock_hass, mock_config_entry, mock_nord_pool_state
+    mock_hass, mock_config_entry
 ):
     """Test that automation status sensor reflects coordinator state changes."""
     from custom_components.battery_energy_trading.sensor import AutomationStatusSensor
 
-    mock_hass.states.get = MagicMock(return_value=mock_nord_pool_state)
-
     # Create coordinator
     coordinator = BatteryEnergyTradingCoordinator(mock_hass, "sensor.nordpool_test")
 
@@ -144,28 +153,19 @@ async def test_automation_status_sensor_responds_to_coordinator(
     )
 
     # Initial state - idle (but sensor needs data first)
-    coordinator.data = await coordinator._async_update_data()
+    coordinator.data = dict(IDLE_AUTOMATION_DATA)
     assert sensor.native_value == "Idle"
 
-    # Record discharge action
-    coordinator.record_action("discharge")
-    coordinator.data = await coordinator._async_update_data()
+    for action_args, expected_state, expected_active in AUTOMATION_TRANSITIONS:
+        _apply_transition(coordinator, action_args)
 
-    # Sensor should show active discharge
-    assert sensor.native_value == "Active - Discharging"
-    attrs = sensor.extra_state_attributes
-    assert attrs["last_action"] == "discharge"
-    assert attrs["automation_active"] is True
-
-    # Clear action
-    coordinator.clear_action()
-    coordinator.data = await coordinator._async_update_data()
-
-    # Sensor should return to idle
-    assert sensor.native_value == "Idle"
+        assert sensor.native_value == expected_state
+        attrs = sensor.extra_state_attributes
+        assert attrs["automation_active"] is expected_active
+        if action_args:
+            assert attrs["last_action"] == action_args[0]
 
 
-@pytest.mark.asyncio
 @patch("custom_components.battery_energy_trading.SungrowHelper")
 async def test_generate_automation_scripts_service(
     mock_sungrow_helper_class, mock_hass, mock_config_entry
@@ -175,16 +175,8 @@ async def test_generate_automation_scripts_service(
     await async_setup(mock_hass, {})
 
     # Setup config entry with coordinator
-    with patch(
-        "custom_components.battery_energy_trading.BatteryEnergyTradingCoordinator"
-    ) as mock_coordinator_class:
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
-
-        mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
-
-        await async_setup_entry(mock_hass, mock_config_entry)
+    async with bootstrapped_entry(mock_hass, mock_config_entry):
+        pass
 
     # Get generate_automation_scripts service handler
     generate_handler = None
@@ -196,23 +188,9 @@ async def test_generate_automation_scripts_service(
     assert generate_handler is not None
 
     # Create service call
-    from homeassistant.core import ServiceCall
-    import inspect
-
-    sig = inspect.signature(ServiceCall.__init__)
-    if "hass" in sig.parameters:
-        service_call = ServiceCall(
-            hass=mock_hass,
-            domain=DOMAIN,
-            service="generate_automation_scripts",
-            data={"config_entry_id": mock_config_entry.entry_id},
-        )
-    else:
-        service_call = ServiceCall(
-            domain=DOMAIN,
-            service="generate_automation_scripts",
-            data={"config_entry_id": mock_config_entry.entry_id},
-        )
+    service_call = create_service_call(
+        "generate_automation_scripts", {"config_entry_id": mock_config_entry.entry_id}
+    )
 
     # Track event firing
     fired_events = []
@@ -245,25 +223,13 @@ async def test_generate_automation_scripts_service(
     assert "yaml" in event_data
 
 
-@pytest.mark.asyncio
 async def test_dashboard_service_buttons_integration(mock_hass, mock_config_entry):
     """Test that dashboard service buttons can call services successfully."""
     # Setup integration
     await async_setup(mock_hass, {})
 
     # Setup config entry
-    with patch(
-        "custom_components.battery_energy_trading.BatteryEnergyTradingCoordinator"
-    ) as mock_coordinator_class:
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
-
-        mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
-
-        await async_setup_entry(mock_hass, mock_config_entry)
-
+    async with bootstrapped_entry(mock_hass, mock_config_entry) as mock_coordinator:
         # Simulate dashboard button clicks (service calls without config_entry_id)
 
         # Test 1: Generate Automation Scripts button
@@ -273,21 +239,8 @@ async def test_dashboard_service_buttons_integration(mock_hass, mock_config_entr
                 generate_handler = call[0][2]
                 break
 
-        from homeassistant.core import ServiceCall
-        import inspect
-
-        sig = inspect.signature(ServiceCall.__init__)
-        if "hass" in sig.parameters:
-            service_call = ServiceCall(
-                hass=mock_hass,
-                domain=DOMAIN,
-                service="generate_automation_scripts",
-                data={},  # No config_entry_id - should auto-detect
-            )
-        else:
-            service_call = ServiceCall(
-                domain=DOMAIN, service="generate_automation_scripts", data={}
-            )
+        # No config_entry_id - should auto-detect
+        service_call = create_service_call("generate_automation_scripts")
 
         # Mock async_entries to return our config entry
         mock_hass.config_entries.async_entries = MagicMock(
@@ -312,12 +265,7 @@ async def test_dashboard_service_buttons_integration(mock_hass, mock_config_entr
                 force_refresh_handler = call[0][2]
                 break
 
-        if "hass" in sig.parameters:
-            service_call = ServiceCall(
-                hass=mock_hass, domain=DOMAIN, service="force_refresh", data={}
-            )
-        else:
-            service_call = ServiceCall(domain=DOMAIN, service="force_refresh", data={})
+        service_call = create_service_call("force_refresh")
 
         await force_refresh_handler(service_call)
 
@@ -325,7 +273,6 @@ async def test_dashboard_service_buttons_integration(mock_hass, mock_config_entr
         mock_coordinator.async_request_refresh.assert_called()
 
 
-@pytest.mark.asyncio
 async def test_sensor_registration_includes_automation_status(
     mock_hass, mock_config_entry
 ):
@@ -370,14 +317,13 @@ async def test_sensor_registration_includes_automation_status(
         assert automation_status_sensor._attr_name == "Automation Status"
 
 
-@pytest.mark.asyncio
 async def test_end_to_end_automation_monitoring_flow(
     mock_hass, mock_config_entry, mock_nord_pool_state
 ):
     """Test complete flow: setup → record action → sensor updates → dashboard displays."""
     from custom_components.battery_energy_trading.sensor import AutomationStatusSensor
 
-    mock_hass.states.get = MagicMock(return_value=mock_nord_pool_state)
+    mock_hass.states.get = make_states({"sensor.nordpool_test": mock_nord_pool_state})
 
     # Step 1: Create coordinator (simulates integration setup)
     coordinator = BatteryEnergyTradingCoordinator(mock_hass, "sensor.nordpool_test")
@@ -395,115 +341,58 @@ async def test_end_to_end_automation_monitoring_flow(
     assert sensor.native_value == "Idle"
     assert sensor.extra_state_attributes["automation_active"] is False
 
-    # Step 4: User automation triggers discharge (simulates Sungrow automation running)
-    coordinator.record_action(
-        action="discharge",
-        next_discharge_slot="2025-10-31T16:00:00",
-        next_charge_slot=None,
-    )
-
-    # Step 5: Coordinator updates (happens every 60 seconds)
-    coordinator.data = await coordinator._async_update_data()
-
-    # Step 6: Sensor reflects new state
-    assert sensor.native_value == "Active - Discharging"
-    attrs = sensor.extra_state_attributes
-    assert attrs["last_action"] == "discharge"
-    assert attrs["last_action_time"] is not None
-    assert attrs["automation_active"] is True
-    assert attrs["next_scheduled_action"] == "2025-10-31T16:00:00"
-
-    # Step 7: Discharge slot ends, automation returns to self-consumption
-    coordinator.clear_action()
-    coordinator.data = await coordinator._async_update_data()
-
-    # Step 8: Sensor shows idle again
-    assert sensor.native_value == "Idle"
-    assert sensor.extra_state_attributes["automation_active"] is False
-
-    # Step 9: Next slot triggers charging
-    coordinator.record_action(
-        action="charge",
-        next_discharge_slot=None,
-        next_charge_slot="2025-11-01T03:00:00",
-    )
-    coordinator.data = await coordinator._async_update_data()
-
-    # Step 10: Sensor shows charging state
-    assert sensor.native_value == "Active - Charging"
-    assert sensor.extra_state_attributes["last_action"] == "charge"
-
-
-@pytest.mark.asyncio
-async def test_multiple_service_calls_in_sequence(mock_hass, mock_config_entry):
-    """Test calling multiple services in sequence (as dashboard buttons would)."""
-    # Setup
+    # Step 4: Automation discharges, returns to self-consumption, then charges.
+    # Each step goes through record_action()/clear_action() and a real update.
+    for action_args, expected_state, expected_active in AUTOMATION_TRANSITIONS:
+        if action_args:
+            coordinator.record_action(*action_args)
+        else:
+            coordinator.clear_action()
+        coordinator.data = await coordinator._async_update_data()
+
+        assert sensor.native_value == expected_state
+        attrs = sensor.extra_state_attributes
+        assert attrs["automation_active"] is expected_active
+        if action_args:
+            action, next_discharge_slot, next_charge_slot = action_args
+            assert attrs["last_action"] == action
+            assert attrs["last_action_time"] is not None
+            assert attrs["next_scheduled_action"] == (next_discharge_slot or next_charge_slot)
+
+
+@pytest.fixture
+async def setup_integration(mock_hass, mock_config_entry):
+    """Set up the integration and yield its service handlers and coordinator."""
     await async_setup(mock_hass, {})
 
-    with patch(
-        "custom_components.battery_energy_trading.BatteryEnergyTradingCoordinator"
-    ) as mock_coordinator_class:
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
-        mock_coordinator_class.return_value = mock_coordinator
-
-        mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
-        mock_hass.config_entries.async_entries = MagicMock(
-            return_value=[mock_config_entry]
-        )
-        mock_hass.config_entries.async_get_entry = MagicMock(
-            return_value=mock_config_entry
-        )
-
-        await async_setup_entry(mock_hass, mock_config_entry)
-
-        # Get service handlers
-        handlers = {}
-        for call in mock_hass.services.async_register.call_args_list:
-            service_name = call[0][1]
-            handler = call[0][2]
-            handlers[service_name] = handler
-
-        from homeassistant.core import ServiceCall
-        import inspect
-
-        sig = inspect.signature(ServiceCall.__init__)
+    mock_hass.config_entries.async_entries = MagicMock(return_value=[mock_config_entry])
+    mock_hass.config_entries.async_get_entry = MagicMock(return_value=mock_config_entry)
+    mock_hass.bus = MagicMock()
 
-        # Sequence 1: Force refresh
-        if "hass" in sig.parameters:
-            call1 = ServiceCall(hass=mock_hass, domain=DOMAIN, service="force_refresh", data={})
-        else:
-            call1 = ServiceCall(domain=DOMAIN, service="force_refresh", data={})
-
-        await handlers["force_refresh"](call1)
-        assert mock_coordinator.async_request_refresh.call_count == 1
+    async with bootstrapped_entry(mock_hass, mock_config_entry) as mock_coordinator:
+        handlers = {
+            call[0][1]: call[0][2]
+            for call in mock_hass.services.async_register.call_args_list
+        }
+        yield handlers, mock_coordinator
 
-        # Sequence 2: Generate automations
-        if "hass" in sig.parameters:
-            call2 = ServiceCall(
-                hass=mock_hass, domain=DOMAIN, service="generate_automation_scripts", data={}
-            )
-        else:
-            call2 = ServiceCall(
-                domain=DOMAIN, service="generate_automation_scripts", data={}
-            )
 
-        # Mock bus.async_fire if not already mocked
-        if not hasattr(mock_hass, 'bus'):
-            mock_hass.bus = MagicMock()
-        mock_hass.bus.async_fire = MagicMock()
+@pytest.mark.parametrize(
+    ("service", "expected_refresh_calls"),
+    [
+        ("force_refresh", 1),
+        ("generate_automation_scripts", 0),
+    ],
+)
+async def test_dashboard_service_call(
+    setup_integration, mock_hass, mock_config_entry, service, expected_refresh_calls
+):
+    """Test each dashboard button service against a freshly set up integration."""
+    handlers, mock_coordinator = setup_integration
 
-        await handlers["generate_automation_scripts"](call2)
+    await handlers[service](create_service_call(service))
 
+    assert mock_coordinator.async_request_refresh.call_count == expected_refresh_calls
+    if service == "generate_automation_scripts":
         automation_key = f"{mock_config_entry.entry_id}_automations"
         assert automation_key in mock_hass.data[DOMAIN]
-
-        # Sequence 3: Force refresh again (user clicked refresh after generating)
-        if "hass" in sig.parameters:
-            call3 = ServiceCall(hass=mock_hass, domain=DOMAIN, service="force_refresh", data={})
-        else:
-            call3 = ServiceCall(domain=DOMAIN, service="force_refresh", data={})
-
-        await handlers["force_refresh"](call3)
-        assert mock_coordinator.async_request_refresh.call_count == 2
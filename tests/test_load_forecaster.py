@@ -1,5 +1,5 @@
 """Tests for load forecasting model."""
-import tempfile
+import copy
 from pathlib import Path
 
 import numpy as np
@@ -10,6 +10,53 @@ from custom_components.battery_energy_trading.ai.models.load_forecaster import (
 )
 
 
+pytestmark = pytest.mark.xdist_group("ml")
+
+
+@pytest.fixture(scope="session")
+def training_data() -> tuple[np.ndarray, np.ndarray]:
+    """Create synthetic training data (shared, treat as read-only)."""
+    np.random.seed(42)
+    n_samples = 500
+    n_features = 15
+
+    X = np.random.randn(n_samples, n_features)
+    # Target is load based on temperature and time
+    y = 2000 + 500 * X[:, 0] + np.random.randn(n_samples) * 100
+    y = np.clip(y, 500, 10000)
+
+    # Shared across the session, so guard against in-place mutation
+    X.setflags(write=False)
+    y.setflags(write=False)
+    return X, y
+
+
+@pytest.fixture(scope="session")
+def _trained_forecaster(training_data: tuple[np.ndarray, np.ndarray]) -> LoadForecaster:
+    """Train a single load forecaster once per session."""
+    forecaster = LoadForecaster(n_estimators=10)  # Small for tests
+    forecaster.train(*training_data)
+    return forecaster
+
+
+@pytest.fixture
+def trained_forecaster(_trained_forecaster: LoadForecaster) -> LoadForecaster:
+    """Provide a private copy of the session-trained forecaster."""
+    return copy.deepcopy(_trained_forecaster)
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory for save/load round trips, created once per module."""
+    return tmp_path_factory.mktemp("lf")
+
+
+@pytest.fixture(scope="module")
+def empty_model_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Shared empty directory for the failure-path tests (never written)."""
+    return tmp_path_factory.mktemp("lf_empty")
+
+
 class TestLoadForecaster:
     """Test load forecaster model."""
 
@@ -18,20 +65,6 @@ class TestLoadForecaster:
         """Create load forecaster."""
         return LoadForecaster(n_estimators=10)  # Small for tests
 
-    @pytest.fixture
-    def training_data(self) -> tuple[np.ndarray, np.ndarray]:
-        """Create synthetic training data."""
-        np.random.seed(42)
-        n_samples = 500
-        n_features = 15
-
-        X = np.random.randn(n_samples, n_features)
-        # Target is load based on temperature and time
-        y = 2000 + 500 * X[:, 0] + np.random.randn(n_samples) * 100
-        y = np.clip(y, 500, 10000)
-
-        return X, y
-
     def test_init(self, forecaster: LoadForecaster) -> None:
         """Test forecaster initialization."""
         assert forecaster.name == "load_forecaster"
@@ -60,65 +93,51 @@ class TestLoadForecaster:
         assert metrics["n_models"] == 1
 
     def test_predict_load(
-        self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
+        self,
+        trained_forecaster: LoadForecaster,
+        training_data: tuple[np.ndarray, np.ndarray],
     ) -> None:
         """Test load prediction."""
-        X, y = training_data
-        forecaster.train(X, y)
+        X, _ = training_data
 
-        predictions = forecaster.predict(X[:10])
+        predictions = trained_forecaster.predict(X[:10])
         assert predictions.shape == (10,)
         assert np.all(predictions > 0)  # Load should be positive
 
-    def test_predict_before_train(self, forecaster: LoadForecaster) -> None:
+    def test_predict_before_train(
+        self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
+    ) -> None:
         """Test prediction fails before training."""
-        X = np.random.randn(10, 15)
+        X, _ = training_data
         with pytest.raises(RuntimeError):
-            forecaster.predict(X)
-
-    def test_predict_heat_pump_stage(self, forecaster: LoadForecaster) -> None:
-        """Test heat pump stage prediction."""
-        assert hasattr(forecaster, "predict_heat_pump_stage")
-
-        # Test temperature to stage mapping
-        stage = forecaster.predict_heat_pump_stage(-10.0)  # Very cold
-        assert stage in [12, 15]  # Should be high stage
-
-        stage = forecaster.predict_heat_pump_stage(20.0)  # Warm
-        assert stage == 0  # Heat pump off
-
-    def test_predict_heat_pump_stages_all(
-        self, forecaster: LoadForecaster
-    ) -> None:
-        """Test all heat pump stage thresholds."""
-        # Above 15°C: off
-        assert forecaster.predict_heat_pump_stage(20.0) == 0
-        assert forecaster.predict_heat_pump_stage(16.0) == 0
-
-        # 10-15°C: 3kW
-        assert forecaster.predict_heat_pump_stage(12.0) == 3
-
-        # 5-10°C: 6kW
-        assert forecaster.predict_heat_pump_stage(7.0) == 6
-
-        # 0-5°C: 9kW
-        assert forecaster.predict_heat_pump_stage(2.0) == 9
-
-        # -5-0°C: 12kW
-        assert forecaster.predict_heat_pump_stage(-3.0) == 12
-
-        # Below -5°C: 15kW
-        assert forecaster.predict_heat_pump_stage(-10.0) == 15
+            forecaster.predict(X[:10])
+
+    @pytest.mark.parametrize(
+        ("temperature", "expected_stage"),
+        [
+            (20.0, 0),  # Above 15°C: off
+            (16.0, 0),
+            (12.0, 3),  # 10-15°C: 3kW
+            (7.0, 6),  # 5-10°C: 6kW
+            (2.0, 9),  # 0-5°C: 9kW
+            (-3.0, 12),  # -5-0°C: 12kW
+            (-10.0, 15),  # Below -5°C: 15kW
+        ],
+    )
+    def test_predict_heat_pump_stage(self, temperature: float, expected_stage: int) -> None:
+        """Test heat pump stage thresholds (no instance needed)."""
+        assert LoadForecaster.predict_heat_pump_stage(temperature) == expected_stage
 
     def test_predict_with_heat_pump(
-        self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
+        self,
+        trained_forecaster: LoadForecaster,
+        training_data: tuple[np.ndarray, np.ndarray],
     ) -> None:
         """Test combined prediction with heat pump."""
-        X, y = training_data
-        forecaster.train(X, y)
+        X, _ = training_data
 
         temperatures = np.array([-5.0, 0.0, 10.0, 20.0, 30.0])
-        base_load, hp_load = forecaster.predict_with_heat_pump(X[:5], temperatures)
+        base_load, hp_load = trained_forecaster.predict_with_heat_pump(X[:5], temperatures)
 
         assert base_load.shape == (5,)
         assert hp_load.shape == (5,)
@@ -126,36 +145,39 @@ class TestLoadForecaster:
         assert hp_load[0] > hp_load[-1]
 
     def test_save_and_load(
-        self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
+        self,
+        trained_forecaster: LoadForecaster,
+        training_data: tuple[np.ndarray, np.ndarray],
+        model_dir: Path,
     ) -> None:
         """Test saving and loading model."""
-        X, y = training_data
-        forecaster.train(X, y)
+        X, _ = training_data
+        forecaster = trained_forecaster
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            forecaster.save(path)
+        forecaster.save(model_dir)
 
-            new_forecaster = LoadForecaster()
-            new_forecaster.load(path)
+        new_forecaster = LoadForecaster()
+        new_forecaster.load(model_dir)
 
-            assert new_forecaster.is_trained is True
-            # Predictions should match
-            original_pred = forecaster.predict(X[:5])
-            loaded_pred = new_forecaster.predict(X[:5])
-            np.testing.assert_array_almost_equal(original_pred, loaded_pred)
+        assert new_forecaster.is_trained is True
+        # Predictions should match
+        original_pred = forecaster.predict(X[:5])
+        loaded_pred = new_forecaster.predict(X[:5])
+        np.testing.assert_array_almost_equal(original_pred, loaded_pred)
 
-    def test_save_untrained_fails(self, forecaster: LoadForecaster) -> None:
+    def test_save_untrained_fails(
+        self, forecaster: LoadForecaster, empty_model_dir: Path
+    ) -> None:
         """Test saving untrained model raises error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(RuntimeError):
-                forecaster.save(Path(tmpdir))
+        with pytest.raises(RuntimeError):
+            forecaster.save(empty_model_dir)
 
-    def test_load_missing_file(self, forecaster: LoadForecaster) -> None:
+    def test_load_missing_file(
+        self, forecaster: LoadForecaster, empty_model_dir: Path
+    ) -> None:
         """Test loading from missing file raises error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(FileNotFoundError):
-                forecaster.load(Path(tmpdir))
+        with pytest.raises(FileNotFoundError):
+            forecaster.load(empty_model_dir)
 
     def test_set_feature_names(
         self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
@@ -170,15 +192,10 @@ class TestLoadForecaster:
         # Feature names should be preserved
         assert forecaster._feature_names == feature_names
 
-    def test_predictions_non_negative(
-        self, forecaster: LoadForecaster, training_data: tuple[np.ndarray, np.ndarray]
-    ) -> None:
+    def test_predictions_non_negative(self, trained_forecaster: LoadForecaster) -> None:
         """Test predictions are always non-negative."""
-        X, y = training_data
-        forecaster.train(X, y)
-
         # Use extreme negative inputs that might push predictions negative
         extreme_X = np.ones((5, 15)) * -100
-        predictions = forecaster.predict(extreme_X)
+        predictions = trained_forecaster.predict(extreme_X)
 
         assert np.all(predictions >= 0)
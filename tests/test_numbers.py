@@ -1,6 +1,8 @@
 """Tests for number platform."""
+import copy
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import Mock, MagicMock
 
 from custom_components.battery_energy_trading.number import (
     async_setup_entry,
@@ -15,346 +17,301 @@ from custom_components.battery_energy_trading.const import (
     DEFAULT_MAX_FORCE_CHARGE_PRICE,
     DEFAULT_DISCHARGE_RATE_KW,
     DEFAULT_CHARGE_RATE_KW,
+    NUMBER_CHARGE_RATE_KW,
+    NUMBER_DISCHARGE_RATE_KW,
 )
 
+from .helpers import MOCK_CONFIG_ENTRY_DATA, reset_config_entry
+
+
+# Specific number entity specs, captured once at import time. Field order matches
+# the BatteryTradingNumber constructor after ``entry``:
+# (number_type, name, min, max, step, default, unit, icon)
+SPECS = (
+    (
+        "forced_discharge_hours",
+        "Forced Discharge Hours",
+        0,
+        24,
+        1,
+        DEFAULT_FORCED_DISCHARGE_HOURS,
+        "hours",
+        "mdi:clock-outline",
+    ),
+    (
+        "min_export_price",
+        "Minimum Export Price",
+        -0.3,
+        0.1,
+        0.0001,
+        DEFAULT_MIN_EXPORT_PRICE,
+        "EUR",
+        "mdi:currency-eur",
+    ),
+    (
+        "min_forced_sell_price",
+        "Minimum Forced Sell Price",
+        0,
+        0.5,
+        0.01,
+        DEFAULT_MIN_FORCED_SELL_PRICE,
+        "EUR",
+        "mdi:currency-eur",
+    ),
+    (
+        "max_force_charge_price",
+        "Maximum Force Charge Price",
+        -0.5,
+        0.20,
+        0.005,
+        DEFAULT_MAX_FORCE_CHARGE_PRICE,
+        "EUR",
+        "mdi:currency-eur",
+    ),
+    (
+        "discharge_rate_kw",
+        "Battery Discharge Rate",
+        1.0,
+        20.0,
+        0.5,
+        DEFAULT_DISCHARGE_RATE_KW,
+        "kW",
+        "mdi:battery-arrow-up",
+    ),
+    (
+        "charge_rate_kw",
+        "Battery Charge Rate",
+        1.0,
+        20.0,
+        0.5,
+        DEFAULT_CHARGE_RATE_KW,
+        "kW",
+        "mdi:battery-arrow-down",
+    ),
+)
+SPECS_BY_TYPE = {spec[0]: spec for spec in SPECS}
+
+# Default constructor arguments for generic test number entities
+_DEFAULT_KW = MappingProxyType(
+    {
+        "min_value": 0.0,
+        "max_value": 100.0,
+        "step": 1.0,
+        "default": 50.0,
+        "unit": "%",
+        "icon": "mdi:test",
+    }
+)
+
+
+def make_number(entry, number_type, name, **overrides):
+    """Build a BatteryTradingNumber from the test defaults plus overrides."""
+    return BatteryTradingNumber(
+        entry=entry, number_type=number_type, name=name, **{**_DEFAULT_KW, **overrides}
+    )
 
-@pytest.mark.asyncio
-async def test_async_setup_entry(mock_hass, mock_config_entry):
-    """Test number platform setup."""
-    async_add_entities = Mock()
 
+# Expected attributes of the shared "test_number" entity
+EXPECTED_TEST_NUMBER = {
+    "_number_type": "test_number",
+    "_attr_name": "Test Number",
+    "_attr_unique_id": f"{DOMAIN}_test_entry_id_test_number",
+    "_attr_suggested_object_id": f"{DOMAIN}_test_number",
+    "_attr_native_min_value": 0.0,
+    "_attr_native_max_value": 100.0,
+    "_attr_native_step": 1.0,
+    "_attr_native_value": 50.0,
+    "_attr_native_unit_of_measurement": "%",
+    "_attr_icon": "mdi:test",
+    "_attr_has_entity_name": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def ha_state_writes(monkeypatch):
+    """Record async_write_ha_state calls on number entities instead of writing state."""
+    writes = []
+
+    def record_write(self):
+        writes.append(self)
+
+    monkeypatch.setattr(BatteryTradingNumber, "async_write_ha_state", record_write)
+    return writes
+
+
+@pytest.fixture(scope="class")
+def mock_config_entry(session_config_entry):
+    """Config entry reset once per test class; number entities only read it."""
+    return reset_config_entry(
+        session_config_entry, "test_entry_id", MOCK_CONFIG_ENTRY_DATA, {}
+    )
+
+
+async def test_async_setup_entry(mock_hass, mock_config_entry, async_add_entities):
+    """Test number platform setup."""
     await async_setup_entry(mock_hass, mock_config_entry, async_add_entities)
 
     # Verify number entities were added
     assert async_add_entities.called
     numbers = async_add_entities.call_args[0][0]
     assert len(numbers) == 13  # All number entities
-    for number in numbers:
-        assert isinstance(number, BatteryTradingNumber)
+    assert all(type(number) is BatteryTradingNumber for number in numbers)
 
 
-@pytest.mark.asyncio
 async def test_async_setup_entry_with_auto_detected_rates(
-    mock_hass, mock_config_entry_sungrow
+    mock_hass, mock_config_entry_sungrow, async_add_entities
 ):
     """Test number platform setup with auto-detected rates."""
-    async_add_entities = Mock()
-
     await async_setup_entry(mock_hass, mock_config_entry_sungrow, async_add_entities)
 
     numbers = async_add_entities.call_args[0][0]
 
     # Find discharge and charge rate entities
-    discharge_rate = next(
-        n for n in numbers if "discharge_rate" in n._number_type.lower()
-    )
-    charge_rate = next(n for n in numbers if "charge_rate" in n._number_type.lower())
+    by_type = {n._number_type: n for n in numbers}
+    discharge_rate = by_type[NUMBER_DISCHARGE_RATE_KW]
+    charge_rate = by_type[NUMBER_CHARGE_RATE_KW]
 
     # Should use auto-detected rates from config entry options
     assert discharge_rate._attr_native_value == 10.0  # SH10RT
     assert charge_rate._attr_native_value == 10.0  # SH10RT
 
 
+@pytest.fixture(scope="module")
+def number_entity_proto(session_config_entry):
+    """Build the shared test number entity once per module (read-only)."""
+    return make_number(session_config_entry, "test_number", "Test Number")
+
+
 class TestBatteryTradingNumber:
     """Test BatteryTradingNumber entity."""
 
     @pytest.fixture
-    def number_entity(self, mock_config_entry):
-        """Create a number entity for testing."""
-        return BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="test_number",
-            name="Test Number",
-            min_value=0.0,
-            max_value=100.0,
-            step=1.0,
-            default=50.0,
-            unit="%",
-            icon="mdi:test",
-        )
+    def number_entity(self, number_entity_proto):
+        """Create a fresh copy of the number entity for tests that change state."""
+        entity = copy.copy(number_entity_proto)
+        entity._attr_native_value = 50.0
+        return entity
 
-    def test_init(self, number_entity, mock_config_entry):
+    def test_init(self, number_entity_proto, mock_config_entry):
         """Test number entity initialization."""
-        assert number_entity._entry == mock_config_entry
-        assert number_entity._number_type == "test_number"
-        assert number_entity._attr_name == "Test Number"
-        assert (
-            number_entity._attr_unique_id
-            == f"{DOMAIN}_{mock_config_entry.entry_id}_test_number"
-        )
-        assert number_entity._attr_suggested_object_id == f"{DOMAIN}_test_number"
-        assert number_entity._attr_native_min_value == 0.0
-        assert number_entity._attr_native_max_value == 100.0
-        assert number_entity._attr_native_step == 1.0
-        assert number_entity._attr_native_value == 50.0
-        assert number_entity._attr_native_unit_of_measurement == "%"
-        assert number_entity._attr_icon == "mdi:test"
-        assert number_entity._attr_has_entity_name is True
-
-    def test_device_info(self, number_entity, mock_config_entry):
+        snapshot = {attr: getattr(number_entity_proto, attr) for attr in EXPECTED_TEST_NUMBER}
+
+        assert number_entity_proto._entry is mock_config_entry
+        assert snapshot == EXPECTED_TEST_NUMBER
+
+    def test_device_info(self, number_entity_proto, mock_config_entry):
         """Test device info generation."""
-        device_info = number_entity._attr_device_info
+        device_info = number_entity_proto._attr_device_info
         assert device_info["identifiers"] == {(DOMAIN, mock_config_entry.entry_id)}
         assert device_info["name"] == "Battery Energy Trading"
         assert device_info["manufacturer"] == "Battery Energy Trading"
         assert device_info["model"] == "Energy Optimizer"
         assert device_info["sw_version"] == VERSION
 
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_valid(self, number_entity):
-        """Test setting a valid value."""
-        number_entity.async_write_ha_state = Mock()
-
-        await number_entity.async_set_native_value(75.0)
-
-        assert number_entity._attr_native_value == 75.0
-        number_entity.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_min(self, number_entity):
-        """Test setting minimum value."""
-        number_entity.async_write_ha_state = Mock()
-
-        await number_entity.async_set_native_value(0.0)
-
-        assert number_entity._attr_native_value == 0.0
-        number_entity.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_max(self, number_entity):
-        """Test setting maximum value."""
-        number_entity.async_write_ha_state = Mock()
-
-        await number_entity.async_set_native_value(100.0)
-
-        assert number_entity._attr_native_value == 100.0
-        number_entity.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_clamps_above_max(self, number_entity):
-        """Test value is clamped when above maximum."""
-        number_entity.async_write_ha_state = Mock()
-
-        await number_entity.async_set_native_value(150.0)
-
-        # Should be clamped to max (100.0)
-        assert number_entity._attr_native_value == 100.0
-        number_entity.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_clamps_below_min(self, number_entity):
-        """Test value is clamped when below minimum."""
-        number_entity.async_write_ha_state = Mock()
-
-        await number_entity.async_set_native_value(-50.0)
-
-        # Should be clamped to min (0.0)
-        assert number_entity._attr_native_value == 0.0
-        number_entity.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_rate_validation(self, mock_config_entry):
-        """Test rate validation rejects non-positive values."""
-        rate_entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="discharge_rate_kw",
-            name="Discharge Rate",
-            min_value=0.0,
-            max_value=20.0,
-            step=0.5,
-            default=5.0,
-            unit="kW",
-            icon="mdi:battery",
-        )
-        rate_entity.async_write_ha_state = Mock()
-
-        # Try to set rate to 0 (invalid)
-        await rate_entity.async_set_native_value(0.0)
-
-        # Value should not change (stays at default)
-        assert rate_entity._attr_native_value == 5.0
-        rate_entity.async_write_ha_state.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_rate_negative(self, mock_config_entry):
-        """Test rate validation rejects negative values."""
-        rate_entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="charge_rate_kw",
-            name="Charge Rate",
-            min_value=0.0,
-            max_value=20.0,
-            step=0.5,
-            default=5.0,
-            unit="kW",
-            icon="mdi:battery",
-        )
-        rate_entity.async_write_ha_state = Mock()
-
-        await rate_entity.async_set_native_value(-5.0)
-
-        # Value should not change
-        assert rate_entity._attr_native_value == 5.0
-        rate_entity.async_write_ha_state.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_async_set_native_value_rate_positive(self, mock_config_entry):
-        """Test rate validation accepts positive values."""
-        rate_entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="discharge_rate_kw",
-            name="Discharge Rate",
-            min_value=1.0,
+    @pytest.fixture(
+        params=[("discharge_rate_kw", "Discharge Rate"), ("charge_rate_kw", "Charge Rate")],
+        ids=["discharge_rate", "charge_rate"],
+    )
+    def rate_entity(self, request, mock_config_entry):
+        """Create each rate entity (min 0 so non-positive values reach rate validation)."""
+        number_type, name = request.param
+        return make_number(
+            mock_config_entry,
+            number_type,
+            name,
             max_value=20.0,
             step=0.5,
             default=5.0,
             unit="kW",
             icon="mdi:battery",
         )
-        rate_entity.async_write_ha_state = Mock()
 
-        await rate_entity.async_set_native_value(10.0)
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (75.0, 75.0),  # valid
+            (0.0, 0.0),  # minimum
+            (100.0, 100.0),  # maximum
+            (150.0, 100.0),  # clamped to max
+            (-50.0, 0.0),  # clamped to min
+        ],
+    )
+    async def test_async_set_native_value(
+        self, number_entity, ha_state_writes, value, expected
+    ):
+        """Test setting a value stores it, clamped to the entity range."""
+        await number_entity.async_set_native_value(value)
+
+        assert number_entity._attr_native_value == expected
+        assert ha_state_writes == [number_entity]
+
+    @pytest.mark.parametrize(
+        ("value", "expected", "should_write"),
+        [
+            (0.0, 5.0, False),  # zero rejected, stays at default
+            (-5.0, 5.0, False),  # negative rejected
+            (10.0, 10.0, True),  # positive accepted
+        ],
+    )
+    async def test_async_set_native_value_rate_validation(
+        self, rate_entity, ha_state_writes, value, expected, should_write
+    ):
+        """Test rate validation rejects non-positive values."""
+        await rate_entity.async_set_native_value(value)
 
-        assert rate_entity._attr_native_value == 10.0
-        rate_entity.async_write_ha_state.assert_called_once()
+        assert rate_entity._attr_native_value == expected
+        assert ha_state_writes == ([rate_entity] if should_write else [])
 
 
 class TestSpecificNumberEntities:
     """Test specific number entity configurations."""
 
-    def test_forced_discharge_hours(self, mock_config_entry):
-        """Test forced discharge hours entity."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="forced_discharge_hours",
-            name="Forced Discharge Hours",
-            min_value=0,
-            max_value=24,
-            step=1,
-            default=DEFAULT_FORCED_DISCHARGE_HOURS,
-            unit="hours",
-            icon="mdi:clock-outline",
-        )
-
-        assert entity._attr_native_min_value == 0
-        assert entity._attr_native_max_value == 24
-        assert entity._attr_native_step == 1
-        assert entity._attr_native_value == DEFAULT_FORCED_DISCHARGE_HOURS
-        assert entity._attr_native_unit_of_measurement == "hours"
-
-    def test_min_export_price(self, mock_config_entry):
-        """Test minimum export price entity."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="min_export_price",
-            name="Minimum Export Price",
-            min_value=-0.3,
-            max_value=0.1,
-            step=0.0001,
-            default=DEFAULT_MIN_EXPORT_PRICE,
-            unit="EUR",
-            icon="mdi:currency-eur",
-        )
-
-        assert entity._attr_native_min_value == -0.3
-        assert entity._attr_native_max_value == 0.1
-        assert entity._attr_native_step == 0.0001
-        assert entity._attr_native_value == DEFAULT_MIN_EXPORT_PRICE
-        assert entity._attr_native_unit_of_measurement == "EUR"
-
-    def test_min_forced_sell_price(self, mock_config_entry):
-        """Test minimum forced sell price entity."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="min_forced_sell_price",
-            name="Minimum Forced Sell Price",
-            min_value=0,
-            max_value=0.5,
-            step=0.01,
-            default=DEFAULT_MIN_FORCED_SELL_PRICE,
-            unit="EUR",
-            icon="mdi:currency-eur",
-        )
-
-        assert entity._attr_native_min_value == 0
-        assert entity._attr_native_max_value == 0.5
-        assert entity._attr_native_value == DEFAULT_MIN_FORCED_SELL_PRICE
-
-    def test_max_force_charge_price(self, mock_config_entry):
-        """Test maximum force charge price entity."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="max_force_charge_price",
-            name="Maximum Force Charge Price",
-            min_value=-0.5,
-            max_value=0.20,
-            step=0.005,
-            default=DEFAULT_MAX_FORCE_CHARGE_PRICE,
-            unit="EUR",
-            icon="mdi:currency-eur",
-        )
-
-        assert entity._attr_native_min_value == -0.5
-        assert entity._attr_native_max_value == 0.20
-        assert entity._attr_native_value == DEFAULT_MAX_FORCE_CHARGE_PRICE
-
-    def test_discharge_rate(self, mock_config_entry):
-        """Test discharge rate entity."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="discharge_rate_kw",
-            name="Battery Discharge Rate",
-            min_value=1.0,
-            max_value=20.0,
-            step=0.5,
-            default=DEFAULT_DISCHARGE_RATE_KW,
-            unit="kW",
-            icon="mdi:battery-arrow-up",
-        )
-
-        assert entity._attr_native_min_value == 1.0
-        assert entity._attr_native_max_value == 20.0
-        assert entity._attr_native_step == 0.5
-        assert entity._attr_native_value == DEFAULT_DISCHARGE_RATE_KW
-        assert entity._attr_native_unit_of_measurement == "kW"
-
-    def test_charge_rate(self, mock_config_entry):
-        """Test charge rate entity."""
+    @pytest.mark.parametrize(
+        ("number_type", "name", "min_value", "max_value", "step", "default", "unit", "icon"),
+        SPECS,
+        ids=list(SPECS_BY_TYPE),
+    )
+    def test_entity_spec(
+        self,
+        mock_config_entry,
+        number_type,
+        name,
+        min_value,
+        max_value,
+        step,
+        default,
+        unit,
+        icon,
+    ):
+        """Test each specific number entity keeps its configured range and default."""
         entity = BatteryTradingNumber(
             entry=mock_config_entry,
-            number_type="charge_rate_kw",
-            name="Battery Charge Rate",
-            min_value=1.0,
-            max_value=20.0,
-            step=0.5,
-            default=DEFAULT_CHARGE_RATE_KW,
-            unit="kW",
-            icon="mdi:battery-arrow-down",
+            number_type=number_type,
+            name=name,
+            min_value=min_value,
+            max_value=max_value,
+            step=step,
+            default=default,
+            unit=unit,
+            icon=icon,
         )
 
-        assert entity._attr_native_min_value == 1.0
-        assert entity._attr_native_max_value == 20.0
-        assert entity._attr_native_value == DEFAULT_CHARGE_RATE_KW
+        assert entity._attr_native_min_value == min_value
+        assert entity._attr_native_max_value == max_value
+        assert entity._attr_native_step == step
+        assert entity._attr_native_value == default
+        assert entity._attr_native_unit_of_measurement == unit
+        assert entity._attr_icon == icon
 
 
 class TestNumberEntityValidation:
     """Test validation logic in number entities."""
 
-    @pytest.mark.asyncio
     async def test_percentage_entity_clamping(self, mock_config_entry):
         """Test percentage entities clamp correctly."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="battery_level",
-            name="Battery Level",
-            min_value=0,
-            max_value=100,
-            step=1,
-            default=50,
-            unit="%",
-            icon="mdi:battery",
+        entity = make_number(
+            mock_config_entry, "battery_level", "Battery Level", icon="mdi:battery"
         )
-        entity.async_write_ha_state = Mock()
 
         # Test above 100%
         await entity.async_set_native_value(150)
@@ -364,43 +321,21 @@ class TestNumberEntityValidation:
         await entity.async_set_native_value(-25)
         assert entity._attr_native_value == 0
 
-    @pytest.mark.asyncio
     async def test_price_entity_negative_values(self, mock_config_entry):
         """Test price entities handle negative values."""
-        entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="min_export_price",
-            name="Minimum Export Price",
-            min_value=-0.3,
-            max_value=0.1,
-            step=0.001,
-            default=0.0,
-            unit="EUR",
-            icon="mdi:currency-eur",
-        )
-        entity.async_write_ha_state = Mock()
+        entity = BatteryTradingNumber(mock_config_entry, *SPECS_BY_TYPE["min_export_price"])
 
         # Negative price should be allowed within range
         await entity.async_set_native_value(-0.1)
         assert entity._attr_native_value == -0.1
 
-    @pytest.mark.asyncio
-    async def test_hours_entity_zero_allowed(self, mock_config_entry):
+    async def test_hours_entity_zero_allowed(self, mock_config_entry, ha_state_writes):
         """Test hours entities allow zero (unlimited)."""
         entity = BatteryTradingNumber(
-            entry=mock_config_entry,
-            number_type="forced_discharge_hours",
-            name="Forced Discharge Hours",
-            min_value=0,
-            max_value=24,
-            step=1,
-            default=2,
-            unit="hours",
-            icon="mdi:clock",
+            mock_config_entry, *SPECS_BY_TYPE["forced_discharge_hours"]
         )
-        entity.async_write_ha_state = Mock()
 
         # Zero should be allowed (unlimited mode)
         await entity.async_set_native_value(0)
         assert entity._attr_native_value == 0
-        entity.async_write_ha_state.assert_called_once()
+        assert ha_state_writes == [entity]
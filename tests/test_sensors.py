@@ -1,7 +1,8 @@
 """Tests for sensor platform."""
+from typing import NamedTuple
+
 import pytest
-from unittest.mock import Mock, MagicMock, AsyncMock, patch
-from datetime import datetime, timedelta
+from unittest.mock import DEFAULT, Mock, patch
 
 from custom_components.battery_energy_trading.sensor import (
     async_setup_entry,
@@ -18,17 +19,71 @@ from custom_components.battery_energy_trading.const import (
     CONF_BATTERY_CAPACITY_ENTITY,
     CONF_SOLAR_FORECAST_ENTITY,
     CONF_SOLAR_POWER_ENTITY,
+    SWITCH_ENABLE_MULTIDAY_OPTIMIZATION,
+)
+
+from .helpers import (
+    MOCK_CONFIG_ENTRY_DATA,
+    NORD_POOL_RAW_TODAY,
+    FakeState,
+    constant_price_slots,
+    make_states,
+    reset_config_entry,
 )
-from custom_components.battery_energy_trading.energy_optimizer import EnergyOptimizer
 
+# Entity ID of the multi-day optimization switch for the test config entry
+MULTIDAY_SWITCH = f"switch.{DOMAIN}_test_entry_id_{SWITCH_ENABLE_MULTIDAY_OPTIMIZATION}"
+
+# Read-only states matching the conftest Nord Pool and battery capacity mocks
+NORD_POOL_STATE = FakeState(
+    entity_id="sensor.nordpool_kwh_ee_eur_3_10_022",
+    state="0.15",
+    attributes={"raw_today": NORD_POOL_RAW_TODAY, "raw_tomorrow": []},
+)
+BATTERY_CAPACITY_STATE = FakeState(entity_id="sensor.battery_capacity", state="12.8")
+
+# Hourly prices for the day after NORD_POOL_STATE's (shared, read-only)
+TOMORROW_PRICES = constant_price_slots("2025-10-03T00:00", 24, 60, 0.10)
+
+
+@pytest.fixture(scope="module")
+def mock_config_entry(session_config_entry):
+    """Config entry reset once per module; tests only change it via monkeypatch."""
+    return reset_config_entry(
+        session_config_entry, "test_entry_id", MOCK_CONFIG_ENTRY_DATA, {}
+    )
 
-@pytest.mark.asyncio
-async def test_async_setup_entry(mock_hass, mock_config_entry, mock_coordinator):
-    """Test sensor platform setup."""
-    async_add_entities = Mock()
 
+@pytest.fixture
+def mock_hass(module_hass, monkeypatch):
+    """Module-shared hass with ``states.get`` and ``data`` restored after each test."""
+    monkeypatch.setattr(module_hass.states, "get", lambda *_: None)
+    monkeypatch.setattr(module_hass, "data", {})
+    return module_hass
+
+
+@pytest.fixture(autouse=True)
+def clear_optimizer_cache(optimizer):
+    """Drop memoized slot selections so results never leak between tests."""
+    optimizer.clear_cache()
+
+
+# Sensor classes in the order async_setup_entry adds them
+SETUP_SENSOR_CLASSES = (
+    "ConfigurationSensor",
+    "ArbitrageOpportunitiesSensor",
+    "DischargeHoursSensor",
+    "ChargingHoursSensor",
+    "AutomationStatusSensor",
+    "AIStatusSensor",
+)
+
+
+async def test_async_setup_entry(
+    mock_hass, mock_config_entry, mock_coordinator, async_add_entities
+):
+    """Test sensor platform setup wires each sensor to its collaborators."""
     # Setup coordinator in hass.data (normally done by __init__.py)
-    from custom_components.battery_energy_trading.const import DOMAIN
     mock_hass.data[DOMAIN] = {
         mock_config_entry.entry_id: {
             "coordinator": mock_coordinator,
@@ -37,36 +92,43 @@ async def test_async_setup_entry(mock_hass, mock_config_entry, mock_coordinator)
         }
     }
 
-    await async_setup_entry(mock_hass, mock_config_entry, async_add_entities)
+    with patch.multiple(
+        "custom_components.battery_energy_trading.sensor",
+        EnergyOptimizer=DEFAULT,
+        **dict.fromkeys(SETUP_SENSOR_CLASSES, DEFAULT),
+    ) as mocks:
+        await async_setup_entry(mock_hass, mock_config_entry, async_add_entities)
+
+    optimizer = mocks["EnergyOptimizer"].return_value
+    nordpool = MOCK_CONFIG_ENTRY_DATA["nordpool_entity"]
+    common = (mock_hass, mock_config_entry, mock_coordinator, nordpool)
+    levels = ("sensor.battery_level", "sensor.battery_capacity", None)
+
+    mocks["ConfigurationSensor"].assert_called_once_with(*common, *levels)
+    mocks["ArbitrageOpportunitiesSensor"].assert_called_once_with(
+        *common, "sensor.battery_capacity", optimizer
+    )
+    mocks["DischargeHoursSensor"].assert_called_once_with(*common, *levels, optimizer)
+    mocks["ChargingHoursSensor"].assert_called_once_with(*common, *levels, optimizer)
+    mocks["AutomationStatusSensor"].assert_called_once_with(*common)
+    mocks["AIStatusSensor"].assert_called_once_with(*common, None)  # No AI trainer
 
-    # Verify sensors were added
-    assert async_add_entities.called
+    # Verify sensors were added in order
+    async_add_entities.assert_called_once()
     sensors = async_add_entities.call_args[0][0]
-    assert len(sensors) == 6  # Including AIStatusSensor
-    assert isinstance(sensors[0], ConfigurationSensor)
-    assert isinstance(sensors[1], ArbitrageOpportunitiesSensor)
-    assert isinstance(sensors[2], DischargeHoursSensor)
-    assert isinstance(sensors[3], ChargingHoursSensor)
-
-    # Import AutomationStatusSensor and AIStatusSensor for type checking
-    from custom_components.battery_energy_trading.sensor import (
-        AIStatusSensor,
-        AutomationStatusSensor,
-    )
-    assert isinstance(sensors[4], AutomationStatusSensor)
-    assert isinstance(sensors[5], AIStatusSensor)
+    assert sensors == [mocks[name].return_value for name in SETUP_SENSOR_CLASSES]
 
 
 class TestBatteryTradingSensor:
     """Test BatteryTradingSensor base class."""
 
-    @pytest.fixture
-    def sensor(self, mock_hass, mock_config_entry, mock_coordinator):
+    @pytest.fixture(scope="module")
+    def sensor(self, module_hass, session_config_entry, module_coordinator):
         """Create a battery trading sensor."""
         return BatteryTradingSensor(
-            hass=mock_hass,
-            entry=mock_config_entry,
-            coordinator=mock_coordinator,
+            hass=module_hass,
+            entry=session_config_entry,
+            coordinator=module_coordinator,
             nordpool_entity="sensor.nordpool",
             sensor_type="test_sensor",
         )
@@ -90,7 +152,6 @@ class TestBatteryTradingSensor:
         )
         assert sensor._tracked_entities == ["sensor.a", "sensor.b"]
 
-    @pytest.mark.asyncio
     async def test_async_added_to_hass(self, mock_hass, mock_config_entry, mock_coordinator):
         """Test state change listener registration."""
         # Create sensor with multiple tracked entities (including nordpool)
@@ -122,13 +183,13 @@ class TestBatteryTradingSensor:
 class TestConfigurationSensor:
     """Test ConfigurationSensor."""
 
-    @pytest.fixture
-    def config_sensor(self, mock_hass, mock_config_entry, mock_coordinator):
+    @pytest.fixture(scope="module")
+    def config_sensor(self, module_hass, session_config_entry, module_coordinator):
         """Create a configuration sensor."""
         return ConfigurationSensor(
-            hass=mock_hass,
-            entry=mock_config_entry,
-            coordinator=mock_coordinator,
+            hass=module_hass,
+            entry=session_config_entry,
+            coordinator=module_coordinator,
             nordpool_entity="sensor.nordpool",
             battery_level_entity="sensor.battery_level",
             battery_capacity_entity="sensor.battery_capacity",
@@ -176,14 +237,11 @@ class TestConfigurationSensor:
         assert "solar_forecast_entity" not in attrs
 
     def test_extra_state_attributes_with_solar_power_entity(
-        self, mock_hass, mock_config_entry, mock_coordinator
+        self, mock_hass, mock_config_entry, mock_coordinator, monkeypatch
     ):
         """Test configuration sensor includes solar power entity from config."""
-        # Add solar power entity to config entry data
-        mock_config_entry.data = {
-            **mock_config_entry.data,
-            CONF_SOLAR_POWER_ENTITY: "sensor.solar_power",
-        }
+        # Point the config entry at a different solar power entity
+        monkeypatch.setitem(mock_config_entry.data, CONF_SOLAR_POWER_ENTITY, "sensor.pv_power")
 
         config_sensor = ConfigurationSensor(
             hass=mock_hass,
@@ -196,20 +254,19 @@ class TestConfigurationSensor:
         )
 
         attrs = config_sensor.extra_state_attributes
-        assert attrs["solar_power_entity"] == "sensor.solar_power"
+        assert attrs["solar_power_entity"] == "sensor.pv_power"
 
 
 class TestArbitrageOpportunitiesSensor:
     """Test ArbitrageOpportunitiesSensor."""
 
-    @pytest.fixture
-    def arbitrage_sensor(self, mock_hass, mock_config_entry, mock_coordinator):
+    @pytest.fixture(scope="module")
+    def arbitrage_sensor(self, module_hass, session_config_entry, module_coordinator, optimizer):
         """Create an arbitrage opportunities sensor."""
-        optimizer = EnergyOptimizer()
         return ArbitrageOpportunitiesSensor(
-            hass=mock_hass,
-            entry=mock_config_entry,
-            coordinator=mock_coordinator,
+            hass=module_hass,
+            entry=session_config_entry,
+            coordinator=module_coordinator,
             nordpool_entity="sensor.nordpool",
             battery_capacity_entity="sensor.battery_capacity",
             optimizer=optimizer,
@@ -224,30 +281,29 @@ class TestArbitrageOpportunitiesSensor:
 
     def test_state_no_nordpool_entity(self, arbitrage_sensor, mock_hass):
         """Test state when Nord Pool entity not found."""
-        mock_hass.states.get = Mock(return_value=None)
+        mock_hass.states.get = lambda *_: None
         assert arbitrage_sensor.state == "No data available"
 
     def test_state_insufficient_data(self, arbitrage_sensor, mock_hass):
         """Test state with insufficient price data."""
-        mock_state = MagicMock()
-        mock_state.attributes = {"raw_today": [{"value": 0.1}]}
-        mock_hass.states.get = Mock(return_value=mock_state)
+        mock_state = FakeState(attributes={"raw_today": [{"value": 0.1}]})
+        mock_hass.states.get = lambda *_: mock_state
 
         assert arbitrage_sensor.state == "Insufficient data"
 
-    def test_state_with_opportunities(
-        self, arbitrage_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
-        """Test state with detected arbitrage opportunities."""
-        # Setup mocks
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
+    @pytest.fixture(scope="class")
+    def priced_states(self):
+        """Read-only Nord Pool prices and battery capacity, shared by the class."""
+        return make_states(
+            {
+                "sensor.nordpool": NORD_POOL_STATE,
+                "sensor.battery_capacity": BATTERY_CAPACITY_STATE,
+            }
+        )
 
-        mock_hass.states.get = Mock(side_effect=get_state)
+    def test_state_with_opportunities(self, arbitrage_sensor, mock_hass, priced_states):
+        """Test state with detected arbitrage opportunities."""
+        mock_hass.states.get = priced_states
 
         state = arbitrage_sensor.state
         # Should show the best opportunity
@@ -255,34 +311,16 @@ class TestArbitrageOpportunitiesSensor:
         assert "Discharge" in state
         assert "Profit:" in state
 
-    def test_state_no_opportunities(
-        self, arbitrage_sensor, mock_hass, sample_price_data
-    ):
+    def test_state_no_opportunities(self, arbitrage_sensor, mock_hass, mock_nordpool_flat):
         """Test state when no profitable opportunities found."""
-        # Create flat price data (no arbitrage possible)
-        flat_prices = [
+        mock_capacity = FakeState(state="10.0")
+
+        mock_hass.states.get = make_states(
             {
-                "start": datetime(2025, 10, 1, 0, 0) + timedelta(minutes=i * 15),
-                "end": datetime(2025, 10, 1, 0, 0) + timedelta(minutes=(i + 1) * 15),
-                "value": 0.15,  # Same price everywhere
+                "sensor.nordpool": mock_nordpool_flat,
+                "sensor.battery_capacity": mock_capacity,
             }
-            for i in range(96)
-        ]
-
-        mock_nordpool = MagicMock()
-        mock_nordpool.attributes = {"raw_today": flat_prices}
-
-        mock_capacity = MagicMock()
-        mock_capacity.state = "10.0"
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nordpool
-            if entity_id == "sensor.battery_capacity":
-                return mock_capacity
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
+        )
 
         state = arbitrage_sensor.state
         assert state == "No profitable opportunities found"
@@ -294,316 +332,238 @@ class TestArbitrageOpportunitiesSensor:
         state = arbitrage_sensor.state
         assert state == "Error calculating"
 
-    def test_extra_state_attributes(
-        self, arbitrage_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
+    def test_extra_state_attributes(self, arbitrage_sensor, mock_hass, priced_states):
         """Test arbitrage sensor attributes."""
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
+        mock_hass.states.get = priced_states
 
         attrs = arbitrage_sensor.extra_state_attributes
-        assert "opportunities_count" in attrs
-        assert "best_profit" in attrs
-        assert "best_roi" in attrs
-        assert "all_opportunities" in attrs
+        assert {
+            "opportunities_count",
+            "best_profit",
+            "best_roi",
+            "all_opportunities",
+        } <= attrs.keys()
         assert len(attrs["all_opportunities"]) <= 5
 
     def test_extra_state_attributes_no_data(self, arbitrage_sensor, mock_hass):
         """Test attributes when no data available."""
-        mock_hass.states.get = Mock(return_value=None)
+        mock_hass.states.get = lambda *_: None
 
         attrs = arbitrage_sensor.extra_state_attributes
         assert attrs == {}
 
 
-class TestDischargeHoursSensor:
-    """Test DischargeHoursSensor."""
+@pytest.fixture(scope="module")
+def discharge_sensor(module_hass, session_config_entry, module_coordinator, optimizer):
+    """Create a discharge hours sensor."""
+    return DischargeHoursSensor(
+        hass=module_hass,
+        entry=session_config_entry,
+        coordinator=module_coordinator,
+        nordpool_entity="sensor.nordpool",
+        battery_level_entity="sensor.battery_level",
+        battery_capacity_entity="sensor.battery_capacity",
+        solar_forecast_entity="sensor.solar_forecast",
+        optimizer=optimizer,
+    )
 
-    @pytest.fixture
-    def discharge_sensor(self, mock_hass, mock_config_entry, mock_coordinator):
-        """Create a discharge hours sensor."""
-        optimizer = EnergyOptimizer()
-        return DischargeHoursSensor(
-            hass=mock_hass,
-            entry=mock_config_entry,
-            coordinator=mock_coordinator,
-            nordpool_entity="sensor.nordpool",
-            battery_level_entity="sensor.battery_level",
-            battery_capacity_entity="sensor.battery_capacity",
-            solar_forecast_entity="sensor.solar_forecast",
-            optimizer=optimizer,
+
+@pytest.fixture(scope="module")
+def charging_sensor(module_hass, session_config_entry, module_coordinator, optimizer):
+    """Create a charging hours sensor."""
+    return ChargingHoursSensor(
+        hass=module_hass,
+        entry=session_config_entry,
+        coordinator=module_coordinator,
+        nordpool_entity="sensor.nordpool",
+        battery_level_entity="sensor.battery_level",
+        battery_capacity_entity="sensor.battery_capacity",
+        solar_forecast_entity="sensor.solar_forecast",
+        optimizer=optimizer,
+    )
+
+
+class SlotSensorCase(NamedTuple):
+    """How one of the slot sensors differs from the other."""
+
+    fixture: str
+    slots_method: str
+    no_slots_state: str
+    name: str
+    icon: str
+    money_key: str  # Total revenue/cost attribute
+    slot_money_key: str  # Per-slot revenue/cost key
+    battery_level: str  # Battery level (%) used for the with-slots tests
+    selects_slots: bool  # Whether NORD_POOL_STATE prices yield slots
+
+
+SLOT_SENSOR_CASES = {
+    "discharge": SlotSensorCase(
+        fixture="discharge_sensor",
+        slots_method="_get_discharge_slots",
+        no_slots_state="No discharge slots selected",
+        name="Discharge Time Slots",
+        icon="mdi:battery-arrow-up",
+        money_key="estimated_revenue_eur",
+        slot_money_key="revenue",
+        battery_level="75",
+        selects_slots=True,
+    ),
+    "charging": SlotSensorCase(
+        fixture="charging_sensor",
+        slots_method="_get_charging_slots",
+        no_slots_state="No charging slots selected",
+        name="Charging Time Slots",
+        icon="mdi:battery-arrow-down",
+        money_key="estimated_cost_eur",
+        slot_money_key="cost",
+        battery_level="20",  # Low battery to trigger charging
+        selects_slots=False,
+    ),
+}
+
+
+@pytest.fixture(params=list(SLOT_SENSOR_CASES))
+def slot_sensor(request):
+    """Discharge or charging hours sensor, paired with its SlotSensorCase."""
+    case = SLOT_SENSOR_CASES[request.param]
+    return request.getfixturevalue(case.fixture), case
+
+
+@pytest.fixture(scope="module")
+def slot_states_by_case():
+    """Read-only state lookups for each slot sensor case, built once per module."""
+    return {
+        case: make_states(
+            {
+                "sensor.nordpool": NORD_POOL_STATE,
+                "sensor.battery_level": FakeState(
+                    entity_id="sensor.battery_level", state=case.battery_level
+                ),
+                "sensor.battery_capacity": BATTERY_CAPACITY_STATE,
+            }
         )
+        for case in SLOT_SENSOR_CASES.values()
+    }
+
+
+@pytest.fixture
+def slot_sensor_states(slot_sensor, mock_hass, slot_states_by_case):
+    """Serve Nord Pool prices and battery states suitable for slot selection."""
+    _, case = slot_sensor
+    mock_hass.states.get = slot_states_by_case[case]
+
 
-    def test_init(self, discharge_sensor):
-        """Test discharge sensor initialization."""
-        assert discharge_sensor._battery_level_entity == "sensor.battery_level"
-        assert discharge_sensor._battery_capacity_entity == "sensor.battery_capacity"
-        assert discharge_sensor._solar_forecast_entity == "sensor.solar_forecast"
-        assert discharge_sensor._optimizer is not None
-        assert discharge_sensor._attr_name == "Discharge Time Slots"
-        assert discharge_sensor._attr_icon == "mdi:battery-arrow-up"
+class TestSlotSensors:
+    """Test DischargeHoursSensor and ChargingHoursSensor."""
 
-    def test_tracked_entities(self, discharge_sensor):
+    def test_init(self, slot_sensor):
+        """Test slot sensor initialization."""
+        sensor, case = slot_sensor
+        assert sensor._battery_level_entity == "sensor.battery_level"
+        assert sensor._battery_capacity_entity == "sensor.battery_capacity"
+        assert sensor._solar_forecast_entity == "sensor.solar_forecast"
+        assert sensor._optimizer is not None
+        assert sensor._attr_name == case.name
+        assert sensor._attr_icon == case.icon
+
+    def test_tracked_entities(self, slot_sensor):
         """Test tracked entities include all required sensors."""
+        sensor, _ = slot_sensor
         expected = [
             "sensor.nordpool",
             "sensor.battery_level",
             "sensor.battery_capacity",
             "sensor.solar_forecast",
         ]
-        assert discharge_sensor._tracked_entities == expected
-
-    def test_state_no_slots(self, discharge_sensor, mock_hass):
-        """Test state when no discharge slots selected."""
-        mock_hass.states.get = Mock(return_value=None)
-
-        state = discharge_sensor.state
-        assert state == "No discharge slots selected"
-
-    def test_state_with_slots(
-        self, discharge_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
-        """Test state with discharge slots."""
+        assert sensor._tracked_entities == expected
 
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_level":
-                return mock_battery_states["battery_level"]
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
+    def test_state_no_slots(self, slot_sensor, mock_hass):
+        """Test state when no slots are selected."""
+        sensor, case = slot_sensor
+        assert sensor.state == case.no_slots_state
 
-        mock_hass.states.get = Mock(side_effect=get_state)
+    def test_state_with_slots(self, slot_sensor, slot_sensor_states):
+        """Test state with price data available."""
+        sensor, case = slot_sensor
 
-        state = discharge_sensor.state
-        # Should contain time ranges and energy info
-        assert "kWh" in state
+        state = sensor.state
+        assert isinstance(state, str)
+        if case.selects_slots:
+            # Should contain time ranges and energy info
+            assert "kWh" in state
 
-    def test_extra_state_attributes_no_slots(self, discharge_sensor, mock_hass):
+    def test_extra_state_attributes_no_slots(self, slot_sensor, mock_hass):
         """Test attributes when no slots selected."""
-        mock_hass.states.get = Mock(return_value=None)
+        sensor, case = slot_sensor
 
-        attrs = discharge_sensor.extra_state_attributes
+        attrs = sensor.extra_state_attributes
         assert attrs["slot_count"] == 0
         assert attrs["total_energy_kwh"] == 0
-        assert attrs["estimated_revenue_eur"] == 0
+        assert attrs[case.money_key] == 0
         assert attrs["slots"] == []
 
-    def test_extra_state_attributes_with_slots(
-        self, discharge_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
-        """Test attributes with discharge slots."""
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_level":
-                return mock_battery_states["battery_level"]
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
-
-        attrs = discharge_sensor.extra_state_attributes
-        assert attrs["slot_count"] > 0
-        assert attrs["total_energy_kwh"] > 0
-        assert "estimated_revenue_eur" in attrs
-        assert "average_price" in attrs
-        assert len(attrs["slots"]) > 0
-
-        # Verify slot structure
-        first_slot = attrs["slots"][0]
-        assert "start" in first_slot
-        assert "end" in first_slot
-        assert "energy_kwh" in first_slot
-        assert "price" in first_slot
-        assert "revenue" in first_slot
-
-    def test_get_discharge_slots_no_nordpool(self, discharge_sensor, mock_hass):
-        """Test _get_discharge_slots with no Nord Pool entity."""
-        mock_hass.states.get = Mock(return_value=None)
+    def test_extra_state_attributes_with_slots(self, slot_sensor, slot_sensor_states):
+        """Test attributes with price data available."""
+        sensor, case = slot_sensor
 
-        slots = discharge_sensor._get_discharge_slots()
-        assert slots == []
+        attrs = sensor.extra_state_attributes
+        if case.selects_slots:
+            assert attrs["slot_count"] > 0
 
-    def test_get_discharge_slots_no_price_data(self, discharge_sensor, mock_hass):
-        """Test _get_discharge_slots with no price data."""
-        mock_state = MagicMock()
-        mock_state.attributes = {"raw_today": []}
-        mock_hass.states.get = Mock(return_value=mock_state)
+        if attrs["slot_count"] > 0:
+            assert attrs["total_energy_kwh"] > 0
+            assert {case.money_key, "average_price"} <= attrs.keys()
+            assert len(attrs["slots"]) > 0
 
-        slots = discharge_sensor._get_discharge_slots()
-        assert slots == []
+            # Verify slot structure
+            first_slot = attrs["slots"][0]
+            assert {
+                "start",
+                "end",
+                "energy_kwh",
+                "price",
+                case.slot_money_key,
+            } <= first_slot.keys()
+
+    @pytest.mark.parametrize(
+        "nordpool_attributes",
+        [None, {"raw_today": []}],
+        ids=["no_nordpool", "no_price_data"],
+    )
+    def test_get_slots_without_prices(self, slot_sensor, mock_hass, nordpool_attributes):
+        """Test slot selection without a Nord Pool entity or without price data."""
+        sensor, case = slot_sensor
+        if nordpool_attributes is not None:
+            nordpool_state = FakeState(attributes=nordpool_attributes)
+            mock_hass.states.get = lambda *_: nordpool_state
+
+        assert getattr(sensor, case.slots_method)() == []
 
     def test_get_discharge_slots_with_multiday(
         self, discharge_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
     ):
         """Test discharge slots with multi-day optimization."""
         # Add tomorrow's prices
-        tomorrow_prices = [
-            {
-                "start": datetime(2025, 10, 3, 0, 0) + timedelta(hours=i),
-                "end": datetime(2025, 10, 3, 0, 0) + timedelta(hours=i + 1),
-                "value": 0.10,
-            }
-            for i in range(24)
-        ]
-        mock_nord_pool_state.attributes["raw_tomorrow"] = tomorrow_prices
+        mock_nord_pool_state.attributes["raw_tomorrow"] = TOMORROW_PRICES
 
         # Mock multiday switch as ON
-        mock_switch = MagicMock()
-        mock_switch.state = "on"
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_level":
-                return mock_battery_states["battery_level"]
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            if "switch" in entity_id and "multiday" in entity_id:
-                return mock_switch
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
+        mock_switch = FakeState(state="on")
+
+        mock_hass.states.get = make_states(
+            {
+                "sensor.nordpool": mock_nord_pool_state,
+                "sensor.battery_level": mock_battery_states["battery_level"],
+                "sensor.battery_capacity": mock_battery_states["battery_capacity"],
+                MULTIDAY_SWITCH: mock_switch,
+            }
+        )
 
         slots = discharge_sensor._get_discharge_slots()
         # Should get slots considering tomorrow's data
         assert isinstance(slots, list)
 
 
-class TestChargingHoursSensor:
-    """Test ChargingHoursSensor."""
-
-    @pytest.fixture
-    def charging_sensor(self, mock_hass, mock_config_entry, mock_coordinator):
-        """Create a charging hours sensor."""
-        optimizer = EnergyOptimizer()
-        return ChargingHoursSensor(
-            hass=mock_hass,
-            entry=mock_config_entry,
-            coordinator=mock_coordinator,
-            nordpool_entity="sensor.nordpool",
-            battery_level_entity="sensor.battery_level",
-            battery_capacity_entity="sensor.battery_capacity",
-            solar_forecast_entity="sensor.solar_forecast",
-            optimizer=optimizer,
-        )
-
-    def test_init(self, charging_sensor):
-        """Test charging sensor initialization."""
-        assert charging_sensor._battery_level_entity == "sensor.battery_level"
-        assert charging_sensor._battery_capacity_entity == "sensor.battery_capacity"
-        assert charging_sensor._solar_forecast_entity == "sensor.solar_forecast"
-        assert charging_sensor._optimizer is not None
-        assert charging_sensor._attr_name == "Charging Time Slots"
-        assert charging_sensor._attr_icon == "mdi:battery-arrow-down"
-
-    def test_state_no_slots(self, charging_sensor, mock_hass):
-        """Test state when no charging slots selected."""
-        mock_hass.states.get = Mock(return_value=None)
-
-        state = charging_sensor.state
-        assert state == "No charging slots selected"
-
-    def test_state_with_slots(
-        self, charging_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
-        """Test state with charging slots."""
-
-        # Set battery level low to trigger charging
-        low_battery = MagicMock()
-        low_battery.state = "20"
-        low_battery.entity_id = "sensor.battery_level"
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_level":
-                return low_battery
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
-
-        state = charging_sensor.state
-        # Charging slots should be selected for low battery
-        assert isinstance(state, str)
-
-    def test_extra_state_attributes_no_slots(self, charging_sensor, mock_hass):
-        """Test attributes when no slots selected."""
-        mock_hass.states.get = Mock(return_value=None)
-
-        attrs = charging_sensor.extra_state_attributes
-        assert attrs["slot_count"] == 0
-        assert attrs["total_energy_kwh"] == 0
-        assert attrs["estimated_cost_eur"] == 0
-        assert attrs["slots"] == []
-
-    def test_extra_state_attributes_with_slots(
-        self, charging_sensor, mock_hass, mock_nord_pool_state, mock_battery_states
-    ):
-        """Test attributes with charging slots."""
-        # Set battery level low to trigger charging
-        low_battery = MagicMock()
-        low_battery.state = "20"
-        low_battery.entity_id = "sensor.battery_level"
-
-        def get_state(entity_id):
-            if entity_id == "sensor.nordpool":
-                return mock_nord_pool_state
-            if entity_id == "sensor.battery_level":
-                return low_battery
-            if entity_id == "sensor.battery_capacity":
-                return mock_battery_states["battery_capacity"]
-            return None
-
-        mock_hass.states.get = Mock(side_effect=get_state)
-
-        attrs = charging_sensor.extra_state_attributes
-
-        # Should have charging slots for low battery
-        if attrs["slot_count"] > 0:
-            assert attrs["total_energy_kwh"] > 0
-            assert "estimated_cost_eur" in attrs
-            assert "average_price" in attrs
-            assert len(attrs["slots"]) > 0
-
-            # Verify slot structure
-            first_slot = attrs["slots"][0]
-            assert "start" in first_slot
-            assert "end" in first_slot
-            assert "energy_kwh" in first_slot
-            assert "price" in first_slot
-            assert "cost" in first_slot
-
-    def test_get_charging_slots_no_nordpool(self, charging_sensor, mock_hass):
-        """Test _get_charging_slots with no Nord Pool entity."""
-        mock_hass.states.get = Mock(return_value=None)
-
-        slots = charging_sensor._get_charging_slots()
-        assert slots == []
-
-    def test_get_charging_slots_no_price_data(self, charging_sensor, mock_hass):
-        """Test _get_charging_slots with no price data."""
-        mock_state = MagicMock()
-        mock_state.attributes = {"raw_today": []}
-        mock_hass.states.get = Mock(return_value=mock_state)
-
-        slots = charging_sensor._get_charging_slots()
-        assert slots == []
-
-
 class TestAutomationStatusSensor:
     """Test AutomationStatusSensor."""
 
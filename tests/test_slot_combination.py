@@ -2,171 +2,106 @@
 import pytest
 from datetime import datetime, timedelta
 
-from custom_components.battery_energy_trading.energy_optimizer import (
-    EnergyOptimizer,
-    _merge_slot_group,
-)
+from custom_components.battery_energy_trading.energy_optimizer import _merge_slot_group
 
 
-class TestSlotCombination:
-    """Test consecutive slot combination."""
+def _slot(hour, minute, price, amount_key="revenue"):
+    """Build a 15-minute, 1.25 kWh slot starting at hour:minute on 2025-01-01."""
+    start = datetime(2025, 1, 1, hour, minute)
+    return {
+        "start": start,
+        "end": start + timedelta(minutes=15),
+        "price": price,
+        "energy_kwh": 1.25,
+        amount_key: 1.25 * price,
+        "duration_hours": 0.25,
+    }
 
-    def test_combine_two_consecutive_discharge_slots(self):
-        """Test combining two consecutive 15-minute discharge slots."""
-        optimizer = EnergyOptimizer()
 
-        slots = [
+# (id, slots, expected fields of each combined group)
+COMBINE_CASES = [
+    (
+        "two_consecutive",
+        [_slot(20, 0, 0.35), _slot(20, 15, 0.34)],
+        [
             {
                 "start": datetime(2025, 1, 1, 20, 0),
-                "end": datetime(2025, 1, 1, 20, 15),
-                "price": 0.35,
-                "energy_kwh": 1.25,
-                "revenue": 0.4375,
-                "duration_hours": 0.25,
-            },
-            {
-                "start": datetime(2025, 1, 1, 20, 15),
                 "end": datetime(2025, 1, 1, 20, 30),
-                "price": 0.34,
-                "energy_kwh": 1.25,
-                "revenue": 0.425,
-                "duration_hours": 0.25,
-            },
-        ]
-
-        combined = optimizer._combine_consecutive_slots(slots)
-
-        assert len(combined) == 1
-        assert combined[0]["start"] == datetime(2025, 1, 1, 20, 0)
-        assert combined[0]["end"] == datetime(2025, 1, 1, 20, 30)
-        assert combined[0]["energy_kwh"] == 2.5
-        assert combined[0]["revenue"] == pytest.approx(0.8625)
-        assert combined[0]["duration_hours"] == 0.5
-        assert combined[0]["slot_count"] == 2
-
-    def test_combine_non_consecutive_slots_separately(self):
-        """Test that non-consecutive slots are kept separate."""
-        optimizer = EnergyOptimizer()
-
-        slots = [
-            {
-                "start": datetime(2025, 1, 1, 20, 0),
-                "end": datetime(2025, 1, 1, 20, 15),
-                "price": 0.35,
-                "energy_kwh": 1.25,
-                "revenue": 0.4375,
-                "duration_hours": 0.25,
-            },
-            {
-                "start": datetime(2025, 1, 1, 21, 0),  # 45-minute gap
-                "end": datetime(2025, 1, 1, 21, 15),
-                "price": 0.33,
-                "energy_kwh": 1.25,
-                "revenue": 0.4125,
-                "duration_hours": 0.25,
-            },
-        ]
-
-        combined = optimizer._combine_consecutive_slots(slots)
-
-        assert len(combined) == 2
-        assert combined[0]["start"] == datetime(2025, 1, 1, 20, 0)
-        assert combined[1]["start"] == datetime(2025, 1, 1, 21, 0)
-
-    def test_combine_four_consecutive_slots(self):
-        """Test combining four consecutive 15-minute slots into one hour."""
-        optimizer = EnergyOptimizer()
-
-        slots = []
-        start_time = datetime(2025, 1, 1, 19, 0)
-
-        for i in range(4):
-            slot_start = start_time + timedelta(minutes=15 * i)
-            slot_end = slot_start + timedelta(minutes=15)
-            slots.append({
-                "start": slot_start,
-                "end": slot_end,
-                "price": 0.35 - (i * 0.01),  # Slightly decreasing price
-                "energy_kwh": 1.25,
-                "revenue": 1.25 * (0.35 - (i * 0.01)),
-                "duration_hours": 0.25,
-            })
-
-        combined = optimizer._combine_consecutive_slots(slots)
-
-        assert len(combined) == 1
-        assert combined[0]["start"] == datetime(2025, 1, 1, 19, 0)
-        assert combined[0]["end"] == datetime(2025, 1, 1, 20, 0)
-        assert combined[0]["energy_kwh"] == 5.0
-        assert combined[0]["duration_hours"] == 1.0
-        assert combined[0]["slot_count"] == 4
-
-    def test_combine_mixed_consecutive_and_gaps(self):
-        """Test combining slots with multiple consecutive groups."""
-        optimizer = EnergyOptimizer()
-
-        slots = [
-            # Group 1: Two consecutive
+                "energy_kwh": 2.5,
+                "revenue": 0.8625,
+                "duration_hours": 0.5,
+                "slot_count": 2,
+            }
+        ],
+    ),
+    (
+        "non_consecutive",
+        [_slot(20, 0, 0.35), _slot(21, 0, 0.33)],  # 45-minute gap
+        [
+            {"start": datetime(2025, 1, 1, 20, 0)},
+            {"start": datetime(2025, 1, 1, 21, 0)},
+        ],
+    ),
+    (
+        "four_consecutive",
+        [_slot(19, 15 * i, 0.35 - i * 0.01) for i in range(4)],
+        [
             {
                 "start": datetime(2025, 1, 1, 19, 0),
-                "end": datetime(2025, 1, 1, 19, 15),
-                "price": 0.35,
-                "energy_kwh": 1.25,
-                "revenue": 0.4375,
-                "duration_hours": 0.25,
-            },
+                "end": datetime(2025, 1, 1, 20, 0),
+                "energy_kwh": 5.0,
+                "duration_hours": 1.0,
+                "slot_count": 4,
+            }
+        ],
+    ),
+    (
+        "mixed_consecutive_and_gaps",
+        [
+            _slot(19, 0, 0.35),
+            _slot(19, 15, 0.34),
+            _slot(20, 0, 0.36),
+            _slot(20, 15, 0.35),
+            _slot(20, 30, 0.34),
+        ],
+        [
             {
-                "start": datetime(2025, 1, 1, 19, 15),
+                "start": datetime(2025, 1, 1, 19, 0),
                 "end": datetime(2025, 1, 1, 19, 30),
-                "price": 0.34,
-                "energy_kwh": 1.25,
-                "revenue": 0.425,
-                "duration_hours": 0.25,
+                "slot_count": 2,
             },
-            # Gap
-            # Group 2: Three consecutive
             {
                 "start": datetime(2025, 1, 1, 20, 0),
-                "end": datetime(2025, 1, 1, 20, 15),
-                "price": 0.36,
-                "energy_kwh": 1.25,
-                "revenue": 0.45,
-                "duration_hours": 0.25,
-            },
-            {
-                "start": datetime(2025, 1, 1, 20, 15),
-                "end": datetime(2025, 1, 1, 20, 30),
-                "price": 0.35,
-                "energy_kwh": 1.25,
-                "revenue": 0.4375,
-                "duration_hours": 0.25,
-            },
-            {
-                "start": datetime(2025, 1, 1, 20, 30),
                 "end": datetime(2025, 1, 1, 20, 45),
-                "price": 0.34,
-                "energy_kwh": 1.25,
-                "revenue": 0.425,
-                "duration_hours": 0.25,
+                "slot_count": 3,
             },
-        ]
+        ],
+    ),
+    (
+        "charging",
+        [_slot(2, 0, 0.05, "cost"), _slot(2, 15, 0.06, "cost")],
+        [{"energy_kwh": 2.5, "cost": 0.1375, "slot_count": 2}],
+    ),
+]
+COMBINE_IDS = [case[0] for case in COMBINE_CASES]
 
+
+class TestSlotCombination:
+    """Test consecutive slot combination."""
+
+    @pytest.mark.parametrize(
+        ("slots", "expected"), [case[1:] for case in COMBINE_CASES], ids=COMBINE_IDS
+    )
+    def test_combine(self, optimizer, slots, expected):
+        """Test consecutive slots are merged into the expected groups."""
         combined = optimizer._combine_consecutive_slots(slots)
 
-        assert len(combined) == 2
-        # Group 1
-        assert combined[0]["start"] == datetime(2025, 1, 1, 19, 0)
-        assert combined[0]["end"] == datetime(2025, 1, 1, 19, 30)
-        assert combined[0]["slot_count"] == 2
-        # Group 2
-        assert combined[1]["start"] == datetime(2025, 1, 1, 20, 0)
-        assert combined[1]["end"] == datetime(2025, 1, 1, 20, 45)
-        assert combined[1]["slot_count"] == 3
+        assert len(combined) == len(expected)
+        for group, fields in zip(combined, expected, strict=True):
+            assert {key: group[key] for key in fields} == pytest.approx(fields)
 
-    def test_combine_preserves_battery_state(self):
+    def test_combine_preserves_battery_state(self, optimizer):
         """Test that battery state is preserved from first and last slot."""
-        optimizer = EnergyOptimizer()
-
         slots = [
             {
                 "start": datetime(2025, 1, 1, 20, 0),
@@ -196,46 +131,13 @@ class TestSlotCombination:
         assert combined[0]["battery_before"] == 10.0
         assert combined[0]["battery_after"] == 7.5
 
-    def test_combine_charging_slots(self):
-        """Test combining consecutive charging slots."""
-        optimizer = EnergyOptimizer()
-
-        slots = [
-            {
-                "start": datetime(2025, 1, 1, 2, 0),
-                "end": datetime(2025, 1, 1, 2, 15),
-                "price": 0.05,
-                "energy_kwh": 1.25,
-                "cost": 0.0625,
-                "duration_hours": 0.25,
-            },
-            {
-                "start": datetime(2025, 1, 1, 2, 15),
-                "end": datetime(2025, 1, 1, 2, 30),
-                "price": 0.06,
-                "energy_kwh": 1.25,
-                "cost": 0.075,
-                "duration_hours": 0.25,
-            },
-        ]
-
-        combined = optimizer._combine_consecutive_slots(slots)
-
-        assert len(combined) == 1
-        assert combined[0]["energy_kwh"] == 2.5
-        assert combined[0]["cost"] == pytest.approx(0.1375)
-        assert combined[0]["slot_count"] == 2
-
-    def test_empty_slots_list(self):
+    def test_empty_slots_list(self, optimizer):
         """Test that empty slots list returns empty list."""
-        optimizer = EnergyOptimizer()
         combined = optimizer._combine_consecutive_slots([])
         assert combined == []
 
-    def test_single_slot_unchanged(self):
+    def test_single_slot_unchanged(self, optimizer):
         """Test that a single slot is returned unchanged."""
-        optimizer = EnergyOptimizer()
-
         slots = [
             {
                 "start": datetime(2025, 1, 1, 20, 0),
@@ -1,4 +1,5 @@
 """Tests for solar prediction model."""
+import copy
 import tempfile
 from pathlib import Path
 
@@ -10,6 +11,41 @@ from custom_components.battery_energy_trading.ai.models.solar_predictor import (
 )
 
 
+pytestmark = pytest.mark.xdist_group("ml")
+
+
+@pytest.fixture(scope="session")
+def training_data() -> tuple[np.ndarray, np.ndarray]:
+    """Create synthetic training data (shared, treat as read-only)."""
+    np.random.seed(42)
+    n_samples = 500
+    n_features = 10
+
+    X = np.random.randn(n_samples, n_features)
+    # Target is correction factor based on some features
+    y = 0.9 + 0.2 * X[:, 0] + np.random.randn(n_samples) * 0.05
+    y = np.clip(y, 0.5, 1.5)  # Correction factors between 0.5 and 1.5
+
+    # Shared across the session, so guard against in-place mutation
+    X.setflags(write=False)
+    y.setflags(write=False)
+    return X, y
+
+
+@pytest.fixture(scope="session")
+def _trained_predictor(training_data: tuple[np.ndarray, np.ndarray]) -> SolarPredictor:
+    """Train a single solar predictor once per session."""
+    predictor = SolarPredictor(n_estimators=10, max_depth=3)  # Small for tests
+    predictor.train(*training_data)
+    return predictor
+
+
+@pytest.fixture
+def trained_predictor(_trained_predictor: SolarPredictor) -> SolarPredictor:
+    """Provide a private copy of the session-trained predictor."""
+    return copy.deepcopy(_trained_predictor)
+
+
 class TestSolarPredictor:
     """Test solar predictor model."""
 
@@ -18,20 +54,6 @@ class TestSolarPredictor:
         """Create solar predictor."""
         return SolarPredictor(n_estimators=10, max_depth=3)  # Small for tests
 
-    @pytest.fixture
-    def training_data(self) -> tuple[np.ndarray, np.ndarray]:
-        """Create synthetic training data."""
-        np.random.seed(42)
-        n_samples = 500
-        n_features = 10
-
-        X = np.random.randn(n_samples, n_features)
-        # Target is correction factor based on some features
-        y = 0.9 + 0.2 * X[:, 0] + np.random.randn(n_samples) * 0.05
-        y = np.clip(y, 0.5, 1.5)  # Correction factors between 0.5 and 1.5
-
-        return X, y
-
     def test_init(self, predictor: SolarPredictor) -> None:
         """Test predictor initialization."""
         assert predictor.name == "solar_predictor"
@@ -56,48 +78,41 @@ class TestSolarPredictor:
             predictor.predict(X)
 
     def test_predict_after_train(
-        self, predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
     ) -> None:
         """Test prediction after training."""
-        X, y = training_data
-        predictor.train(X, y)
+        X, _ = training_data
 
-        predictions = predictor.predict(X[:10])
+        predictions = trained_predictor.predict(X[:10])
         assert predictions.shape == (10,)
         assert np.all(predictions > 0)  # Correction factors should be positive
 
-    def test_predictions_clipped(
-        self, predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
-    ) -> None:
+    def test_predictions_clipped(self, trained_predictor: SolarPredictor) -> None:
         """Test predictions are clipped to valid range."""
-        X, y = training_data
-        predictor.train(X, y)
-
         # Use extreme inputs
         extreme_X = np.ones((5, 10)) * 100
-        predictions = predictor.predict(extreme_X)
+        predictions = trained_predictor.predict(extreme_X)
 
         # Should be clipped between 0.5 and 1.5
         assert np.all(predictions >= 0.5)
         assert np.all(predictions <= 1.5)
 
     def test_save_and_load(
-        self, predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
     ) -> None:
         """Test saving and loading model."""
-        X, y = training_data
-        predictor.train(X, y)
+        X, _ = training_data
 
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir)
-            predictor.save(path)
+            trained_predictor.save(path)
 
             new_predictor = SolarPredictor()
             new_predictor.load(path)
 
             assert new_predictor.is_trained is True
             # Predictions should match
-            original_pred = predictor.predict(X[:5])
+            original_pred = trained_predictor.predict(X[:5])
             loaded_pred = new_predictor.predict(X[:5])
             np.testing.assert_array_almost_equal(original_pred, loaded_pred)
 
@@ -114,20 +129,46 @@ class TestSolarPredictor:
                 predictor.load(Path(tmpdir))
 
     def test_correct_forecast(
-        self, predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
     ) -> None:
         """Test applying correction to forecast."""
-        X, y = training_data
-        predictor.train(X, y)
+        X, _ = training_data
 
         forecast_value = 5.0  # 5 kWh
         features = X[0]
 
-        corrected, factor = predictor.correct_forecast(forecast_value, features)
+        corrected, factor = trained_predictor.correct_forecast(forecast_value, features)
 
         assert 0.5 <= factor <= 1.5
         assert corrected == forecast_value * factor
 
+    def test_correct_forecast_matches_predict(
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+    ) -> None:
+        """Test the single-row fast path gives the same factor as predict()."""
+        X, _ = training_data
+
+        factors = [trained_predictor.correct_forecast(5.0, row)[1] for row in X[:50]]
+
+        assert factors == trained_predictor.predict(X[:50]).tolist()
+
+    @pytest.mark.parametrize(
+        ("features", "match"),
+        [
+            (np.zeros(20), "has 20 features"),
+            (np.zeros(5), "has 5 features"),
+            (np.full(10, np.nan), "NaN"),
+            (np.full(10, np.inf), "infinity"),
+        ],
+        ids=["too_many_features", "too_few_features", "all_nan", "infinite"],
+    )
+    def test_correct_forecast_invalid_features(
+        self, trained_predictor: SolarPredictor, features: np.ndarray, match: str
+    ) -> None:
+        """Test the single-row fast path rejects bad input like predict() does."""
+        with pytest.raises(ValueError, match=match):
+            trained_predictor.correct_forecast(5.0, features)
+
     def test_correct_forecast_untrained(self, predictor: SolarPredictor) -> None:
         """Test correction returns original when not trained."""
         features = np.random.randn(10)
@@ -136,14 +177,38 @@ class TestSolarPredictor:
         assert corrected == 5.0
         assert factor == 1.0
 
+    def test_correct_forecasts(
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+    ) -> None:
+        """Test batch correction matches correcting each forecast on its own."""
+        X, _ = training_data
+        forecast_values = np.linspace(0.0, 5.0, 24)
+
+        corrected, factors = trained_predictor.correct_forecasts(forecast_values, X[:24])
+
+        expected = [
+            trained_predictor.correct_forecast(value, row)
+            for value, row in zip(forecast_values, X[:24], strict=True)
+        ]
+        assert corrected.tolist() == [value for value, _ in expected]
+        assert factors.tolist() == [factor for _, factor in expected]
+
+    def test_correct_forecasts_untrained(self, predictor: SolarPredictor) -> None:
+        """Test batch correction returns originals when not trained."""
+        forecast_values = np.array([1.0, 2.5, 4.0])
+
+        corrected, factors = predictor.correct_forecasts(forecast_values, np.random.randn(3, 10))
+
+        assert corrected.tolist() == [1.0, 2.5, 4.0]
+        assert factors.tolist() == [1.0, 1.0, 1.0]
+
     def test_get_feature_importance(
-        self, predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
+        self, trained_predictor: SolarPredictor, training_data: tuple[np.ndarray, np.ndarray]
     ) -> None:
         """Test getting feature importance."""
-        X, y = training_data
-        predictor.train(X, y)
+        X, _ = training_data
 
-        importance = predictor.get_feature_importance()
+        importance = trained_predictor.get_feature_importance()
         assert importance is not None
         assert len(importance) == X.shape[1]
         assert sum(importance.values()) > 0
@@ -1,6 +1,8 @@
 """Tests for switch platform."""
+import copy
+
 import pytest
-from unittest.mock import Mock, MagicMock, AsyncMock
+from unittest.mock import Mock
 
 from custom_components.battery_energy_trading.switch import (
     async_setup_entry,
@@ -15,8 +17,68 @@ from custom_components.battery_energy_trading.const import (
     SWITCH_ENABLE_MULTIDAY_OPTIMIZATION,
 )
 
+from .helpers import FakeState
+
+
+# Switch specs in BatteryTradingSwitch constructor order after ``entry``:
+# (switch_type, name, icon, description, default_state)
+SPECS = (
+    ("test_switch", "Test Switch", "mdi:test", "Test switch description", True),
+    (
+        SWITCH_ENABLE_FORCED_CHARGING,
+        "Enable Forced Charging",
+        "mdi:battery-charging",
+        "Allow automatic battery charging during cheap price periods",
+        False,
+    ),
+    (
+        SWITCH_ENABLE_FORCED_DISCHARGE,
+        "Enable Forced Discharge",
+        "mdi:battery-arrow-up",
+        "Allow automatic battery discharge during high price periods",
+        True,
+    ),
+    (
+        SWITCH_ENABLE_EXPORT_MANAGEMENT,
+        "Enable Export Management",
+        "mdi:transmission-tower-export",
+        "Manage grid export based on price thresholds",
+        True,
+    ),
+    (
+        SWITCH_ENABLE_MULTIDAY_OPTIMIZATION,
+        "Enable Multi-Day Optimization (Experimental)",
+        "mdi:calendar-multiple",
+        "Optimize across today + tomorrow using price forecasts and solar estimates",
+        False,
+    ),
+)
+
+
+def _last_state_returning(state):
+    """Build an async_get_last_state replacement that returns ``state``."""
+
+    async def async_get_last_state():
+        return state
+
+    return async_get_last_state
+
+
+@pytest.fixture(scope="module")
+def switch_templates(session_config_entry):
+    """Build one switch per spec once per module (read-only, copy before mutating)."""
+    return {spec[0]: BatteryTradingSwitch(session_config_entry, *spec) for spec in SPECS}
+
+
+@pytest.fixture
+def switch_entity(switch_templates):
+    """Create a fresh copy of the test switch with state writes recorded."""
+    entity = copy.copy(switch_templates["test_switch"])
+    entity._attr_is_on = True
+    entity.async_write_ha_state = Mock()
+    return entity
+
 
-@pytest.mark.asyncio
 async def test_async_setup_entry(mock_hass, mock_config_entry):
     """Test switch platform setup."""
     async_add_entities = Mock()
@@ -34,52 +96,35 @@ async def test_async_setup_entry(mock_hass, mock_config_entry):
 class TestBatteryTradingSwitch:
     """Test BatteryTradingSwitch entity."""
 
-    @pytest.fixture
-    def switch_entity(self, mock_config_entry):
-        """Create a switch entity for testing."""
-        return BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="test_switch",
-            name="Test Switch",
-            icon="mdi:test",
-            description="Test switch description",
-            default_state=True,
-        )
-
-    def test_init(self, switch_entity, mock_config_entry):
-        """Test switch initialization."""
-        assert switch_entity._entry == mock_config_entry
-        assert switch_entity._switch_type == "test_switch"
-        assert switch_entity._attr_name == "Test Switch"
-        assert (
-            switch_entity._attr_unique_id
-            == f"{DOMAIN}_{mock_config_entry.entry_id}_test_switch"
-        )
-        assert switch_entity._attr_suggested_object_id == f"{DOMAIN}_test_switch"
-        assert switch_entity._attr_icon == "mdi:test"
-        assert switch_entity._description == "Test switch description"
-        assert switch_entity._attr_is_on is True
-        assert switch_entity._attr_has_entity_name is True
+    def test_entity_attributes(self, switch_templates, session_config_entry):
+        """Test initialization, device info and extra state attributes."""
+        switch = switch_templates["test_switch"]
+        entry_id = session_config_entry.entry_id
+
+        assert switch._entry is session_config_entry
+        assert switch._switch_type == "test_switch"
+        assert switch._attr_name == "Test Switch"
+        assert switch._attr_unique_id == f"{DOMAIN}_{entry_id}_test_switch"
+        assert switch._attr_suggested_object_id == f"{DOMAIN}_test_switch"
+        assert switch._attr_icon == "mdi:test"
+        assert switch._description == "Test switch description"
+        assert switch._attr_is_on is True
+        assert switch._attr_has_entity_name is True
 
-    def test_device_info(self, switch_entity, mock_config_entry):
-        """Test device info generation."""
-        device_info = switch_entity._attr_device_info
-        assert device_info["identifiers"] == {(DOMAIN, mock_config_entry.entry_id)}
+        device_info = switch._attr_device_info
+        assert device_info["identifiers"] == {(DOMAIN, entry_id)}
         assert device_info["name"] == "Battery Energy Trading"
         assert device_info["manufacturer"] == "Battery Energy Trading"
         assert device_info["model"] == "Energy Optimizer"
         assert device_info["sw_version"] == VERSION
 
-    def test_extra_state_attributes(self, switch_entity):
-        """Test extra state attributes."""
-        attrs = switch_entity.extra_state_attributes
-        assert attrs["description"] == "Test switch description"
-        assert attrs["switch_type"] == "test_switch"
+        assert switch.extra_state_attributes == {
+            "description": "Test switch description",
+            "switch_type": "test_switch",
+        }
 
-    @pytest.mark.asyncio
     async def test_async_turn_on(self, switch_entity):
         """Test turning switch on."""
-        switch_entity.async_write_ha_state = Mock()
         switch_entity._attr_is_on = False
 
         await switch_entity.async_turn_on()
@@ -87,10 +132,8 @@ class TestBatteryTradingSwitch:
         assert switch_entity._attr_is_on is True
         switch_entity.async_write_ha_state.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_async_turn_off(self, switch_entity):
         """Test turning switch off."""
-        switch_entity.async_write_ha_state = Mock()
         switch_entity._attr_is_on = True
 
         await switch_entity.async_turn_off()
@@ -98,22 +141,18 @@ class TestBatteryTradingSwitch:
         assert switch_entity._attr_is_on is False
         switch_entity.async_write_ha_state.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_async_added_to_hass_no_previous_state(self, switch_entity):
         """Test entity added with no previous state."""
-        switch_entity.async_get_last_state = AsyncMock(return_value=None)
+        switch_entity.async_get_last_state = _last_state_returning(None)
 
         await switch_entity.async_added_to_hass()
 
         # Should keep default state (True)
         assert switch_entity._attr_is_on is True
 
-    @pytest.mark.asyncio
     async def test_async_added_to_hass_restore_on(self, switch_entity):
         """Test entity added with previous 'on' state."""
-        mock_last_state = MagicMock()
-        mock_last_state.state = "on"
-        switch_entity.async_get_last_state = AsyncMock(return_value=mock_last_state)
+        switch_entity.async_get_last_state = _last_state_returning(FakeState(state="on"))
         switch_entity._attr_is_on = False  # Different from saved state
 
         await switch_entity.async_added_to_hass()
@@ -121,12 +160,9 @@ class TestBatteryTradingSwitch:
         # Should restore to 'on'
         assert switch_entity._attr_is_on is True
 
-    @pytest.mark.asyncio
     async def test_async_added_to_hass_restore_off(self, switch_entity):
         """Test entity added with previous 'off' state."""
-        mock_last_state = MagicMock()
-        mock_last_state.state = "off"
-        switch_entity.async_get_last_state = AsyncMock(return_value=mock_last_state)
+        switch_entity.async_get_last_state = _last_state_returning(FakeState(state="off"))
         switch_entity._attr_is_on = True  # Different from saved state
 
         await switch_entity.async_added_to_hass()
@@ -135,208 +171,85 @@ class TestBatteryTradingSwitch:
         assert switch_entity._attr_is_on is False
 
 
-class TestForcedChargingSwitch:
-    """Test forced charging switch specific configuration."""
-
-    def test_forced_charging_defaults(self, mock_config_entry):
-        """Test forced charging switch defaults."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type=SWITCH_ENABLE_FORCED_CHARGING,
-            name="Enable Forced Charging",
-            icon="mdi:battery-charging",
-            description="Allow automatic battery charging during cheap price periods",
-            default_state=False,
-        )
-
-        assert switch._switch_type == SWITCH_ENABLE_FORCED_CHARGING
-        assert switch._attr_name == "Enable Forced Charging"
-        assert switch._attr_icon == "mdi:battery-charging"
-        assert switch._attr_is_on is False  # Default: disabled for solar-only
-        assert "charging" in switch._description.lower()
-
-
-class TestForcedDischargeSwitch:
-    """Test forced discharge switch specific configuration."""
-
-    def test_forced_discharge_defaults(self, mock_config_entry):
-        """Test forced discharge switch defaults."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type=SWITCH_ENABLE_FORCED_DISCHARGE,
-            name="Enable Forced Discharge",
-            icon="mdi:battery-arrow-up",
-            description="Allow automatic battery discharge during high price periods",
-            default_state=True,
-        )
-
-        assert switch._switch_type == SWITCH_ENABLE_FORCED_DISCHARGE
-        assert switch._attr_name == "Enable Forced Discharge"
-        assert switch._attr_icon == "mdi:battery-arrow-up"
-        assert switch._attr_is_on is True  # Default: enabled
-        assert "discharge" in switch._description.lower()
-
-
-class TestExportManagementSwitch:
-    """Test export management switch specific configuration."""
-
-    def test_export_management_defaults(self, mock_config_entry):
-        """Test export management switch defaults."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type=SWITCH_ENABLE_EXPORT_MANAGEMENT,
-            name="Enable Export Management",
-            icon="mdi:transmission-tower-export",
-            description="Manage grid export based on price thresholds",
-            default_state=True,
-        )
-
-        assert switch._switch_type == SWITCH_ENABLE_EXPORT_MANAGEMENT
-        assert switch._attr_name == "Enable Export Management"
-        assert switch._attr_icon == "mdi:transmission-tower-export"
-        assert switch._attr_is_on is True  # Default: enabled
-        assert "export" in switch._description.lower()
-
-
-class TestMultidayOptimizationSwitch:
-    """Test multi-day optimization switch specific configuration."""
-
-    def test_multiday_optimization_defaults(self, mock_config_entry):
-        """Test multi-day optimization switch defaults."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type=SWITCH_ENABLE_MULTIDAY_OPTIMIZATION,
-            name="Enable Multi-Day Optimization (Experimental)",
-            icon="mdi:calendar-multiple",
-            description="Optimize across today + tomorrow using price forecasts and solar estimates",
-            default_state=False,
-        )
-
-        assert switch._switch_type == SWITCH_ENABLE_MULTIDAY_OPTIMIZATION
-        assert switch._attr_name == "Enable Multi-Day Optimization (Experimental)"
-        assert switch._attr_icon == "mdi:calendar-multiple"
-        assert switch._attr_is_on is False  # Default: disabled - experimental
-        assert "optimize" in switch._description.lower()
+@pytest.mark.parametrize(
+    ("switch_type", "name", "icon", "default", "keyword"),
+    [
+        (
+            SWITCH_ENABLE_FORCED_CHARGING,
+            "Enable Forced Charging",
+            "mdi:battery-charging",
+            False,  # Default: disabled for solar-only
+            "charging",
+        ),
+        (
+            SWITCH_ENABLE_FORCED_DISCHARGE,
+            "Enable Forced Discharge",
+            "mdi:battery-arrow-up",
+            True,  # Default: enabled
+            "discharge",
+        ),
+        (
+            SWITCH_ENABLE_EXPORT_MANAGEMENT,
+            "Enable Export Management",
+            "mdi:transmission-tower-export",
+            True,  # Default: enabled
+            "export",
+        ),
+        (
+            SWITCH_ENABLE_MULTIDAY_OPTIMIZATION,
+            "Enable Multi-Day Optimization (Experimental)",
+            "mdi:calendar-multiple",
+            False,  # Default: disabled - experimental
+            "optimize",
+        ),
+    ],
+    ids=["forced_charging", "forced_discharge", "export_management", "multiday"],
+)
+def test_switch_defaults(switch_templates, switch_type, name, icon, default, keyword):
+    """Test each platform switch keeps its name, icon, default state and description."""
+    switch = switch_templates[switch_type]
+
+    assert switch._switch_type == switch_type
+    assert switch._attr_name == name
+    assert switch._attr_icon == icon
+    assert switch._attr_is_on is default
+    assert keyword in switch._description.lower()
 
 
 class TestSwitchStateManagement:
     """Test switch state management scenarios."""
 
-    @pytest.mark.asyncio
-    async def test_multiple_toggles(self, mock_config_entry):
-        """Test multiple on/off toggles."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="test_switch",
-            name="Test",
-            icon="mdi:test",
-            description="Test",
-            default_state=False,
-        )
-        switch.async_write_ha_state = Mock()
-
-        # Initial state: off
-        assert switch._attr_is_on is False
-
-        # Turn on
-        await switch.async_turn_on()
-        assert switch._attr_is_on is True
-
-        # Turn off
-        await switch.async_turn_off()
-        assert switch._attr_is_on is False
-
-        # Turn on again
-        await switch.async_turn_on()
-        assert switch._attr_is_on is True
-
-        # Should have written state 3 times
-        assert switch.async_write_ha_state.call_count == 3
-
-    @pytest.mark.asyncio
-    async def test_redundant_turn_on(self, mock_config_entry):
-        """Test turning on when already on."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="test_switch",
-            name="Test",
-            icon="mdi:test",
-            description="Test",
-            default_state=True,
-        )
-        switch.async_write_ha_state = Mock()
-
-        # Already on
-        assert switch._attr_is_on is True
-
-        # Turn on again
-        await switch.async_turn_on()
-        assert switch._attr_is_on is True
-
-        # Should still write state (idempotent)
-        switch.async_write_ha_state.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_redundant_turn_off(self, mock_config_entry):
-        """Test turning off when already off."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="test_switch",
-            name="Test",
-            icon="mdi:test",
-            description="Test",
-            default_state=False,
-        )
-        switch.async_write_ha_state = Mock()
-
-        # Already off
-        assert switch._attr_is_on is False
+    @pytest.mark.parametrize(
+        ("initial", "actions", "final"),
+        [
+            (False, ("on", "off", "on"), True),  # multiple toggles
+            (True, ("on",), True),  # redundant turn on
+            (False, ("off",), False),  # redundant turn off
+        ],
+        ids=["multiple_toggles", "redundant_turn_on", "redundant_turn_off"],
+    )
+    async def test_toggle_sequence(self, switch_entity, initial, actions, final):
+        """Test each turn on/off sets the state and writes it, even when unchanged."""
+        switch_entity._attr_is_on = initial
 
-        # Turn off again
-        await switch.async_turn_off()
-        assert switch._attr_is_on is False
+        for action in actions:
+            await getattr(switch_entity, f"async_turn_{action}")()
 
-        # Should still write state (idempotent)
-        switch.async_write_ha_state.assert_called_once()
+        assert switch_entity._attr_is_on is final
+        assert switch_entity.async_write_ha_state.call_count == len(actions)
 
 
 class TestSwitchUniqueIDs:
     """Test switch unique ID generation."""
 
-    def test_unique_id_format(self, mock_config_entry):
+    def test_unique_id_format(self, switch_templates):
         """Test unique ID follows expected format."""
-        switch = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="custom_switch",
-            name="Custom",
-            icon="mdi:test",
-            description="Test",
-            default_state=False,
-        )
-
-        unique_id = switch._attr_unique_id
+        unique_id = switch_templates["test_switch"]._attr_unique_id
         assert unique_id.startswith(DOMAIN)
         assert "_test_entry_id_" in unique_id
-        assert unique_id.endswith("custom_switch")
+        assert unique_id.endswith("test_switch")
 
-    def test_unique_ids_differ(self, mock_config_entry):
+    def test_unique_ids_differ(self, switch_templates):
         """Test different switches have different unique IDs."""
-        switch1 = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="switch_a",
-            name="A",
-            icon="mdi:test",
-            description="Test",
-            default_state=False,
-        )
-
-        switch2 = BatteryTradingSwitch(
-            entry=mock_config_entry,
-            switch_type="switch_b",
-            name="B",
-            icon="mdi:test",
-            description="Test",
-            default_state=False,
-        )
-
-        assert switch1._attr_unique_id != switch2._attr_unique_id
+        unique_ids = {switch._attr_unique_id for switch in switch_templates.values()}
+        assert len(unique_ids) == len(switch_templates)
@@ -1,7 +1,9 @@
 """Tests for training orchestrator."""
 
-import tempfile
+from collections.abc import Callable, Sequence
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -10,38 +12,149 @@ from custom_components.battery_energy_trading.ai.config import AIConfig
 from custom_components.battery_energy_trading.ai.training.trainer import AITrainer
 
 
+# Entity IDs of the default config, used to key the shared training data
+DEFAULT_CONFIG = AIConfig()
+
+MockData = dict[str, Sequence[dict[str, Any]]]
+
+
+async def _run_inline(func: Callable[..., Any], *args: Any) -> Any:
+    """Stand-in for hass.async_add_executor_job that runs ``func`` in the test's loop."""
+    return func(*args)
+
+
+def _mock_hass(model_dir: Path) -> SimpleNamespace:
+    """Build a minimal Home Assistant stand-in whose ``config.path`` returns ``model_dir``.
+
+    ``config.path`` is a plain function; tests asserting on its calls use
+    ``mock_hass_tracked``.
+    """
+    path = str(model_dir)
+    return SimpleNamespace(
+        config=SimpleNamespace(path=lambda *_: path),
+        async_add_executor_job=_run_inline,
+    )
+
+
+# Hourly sample start times for the two days the tests use
+_JAN_1 = tuple(f"2024-01-01T{h:02d}:00:00" for h in range(24))
+_JUN_15 = tuple(f"2024-06-15T{h:02d}:00:00" for h in range(24))
+
+
+def _samples(starts: Sequence[str], mean: Callable[[int], float]) -> tuple[dict[str, Any], ...]:
+    """Build one day of hourly statistics samples, ``mean`` taking the hour."""
+    return tuple({"start": start, "mean": mean(h)} for h, start in enumerate(starts))
+
+
+# One day of hourly samples per entity, built once at import (read-only)
+SOLAR_SAMPLES = _samples(_JAN_1, lambda h: 1000 + h * 100)
+FORECAST_SAMPLES = _samples(_JAN_1, lambda h: 900 + h * 90)
+LOAD_SAMPLES = _samples(_JAN_1, lambda h: 2000 + h * 50)
+TEMP_SAMPLES = _samples(_JAN_1, lambda _: 15.0)
+BATTERY_SAMPLES = _samples(_JAN_1, lambda h: 50.0 + h)
+PRICE_SAMPLES = _samples(_JAN_1, lambda h: 0.10 + h * 0.01)
+
+JUNE_SOLAR_SAMPLES = _samples(_JUN_15, lambda h: 1000 + h * 100)
+JUNE_FORECAST_SAMPLES = _samples(_JUN_15, lambda h: 900 + h * 90)
+JUNE_LOAD_SAMPLES = _samples(_JUN_15, lambda h: 2000 + h * 50)
+JUNE_TEMP_SAMPLES = _samples(_JUN_15, lambda h: 15.0 + h * 0.5)
+
+
+@pytest.fixture(scope="session")
+def training_mock_data() -> MockData:
+    """240 hourly samples for every trained entity (shared, treat as read-only)."""
+    return {
+        DEFAULT_CONFIG.solar_power_entity: SOLAR_SAMPLES * 10,
+        DEFAULT_CONFIG.solar_forecast_entity: FORECAST_SAMPLES * 10,
+        DEFAULT_CONFIG.load_power_entity: LOAD_SAMPLES * 10,
+        DEFAULT_CONFIG.outdoor_temp_entity: TEMP_SAMPLES * 10,
+        DEFAULT_CONFIG.battery_level_entity: BATTERY_SAMPLES * 10,
+        DEFAULT_CONFIG.nordpool_entity: PRICE_SAMPLES * 10,
+    }
+
+
+def _subset(data: MockData, *entities: str) -> MockData:
+    """Select the given entities from the shared training data."""
+    return {entity: data[entity] for entity in entities}
+
+
+@pytest.fixture(scope="session")
+def solar_mock_data(training_mock_data: MockData) -> MockData:
+    """Training data for the solar model only."""
+    return _subset(
+        training_mock_data,
+        DEFAULT_CONFIG.solar_power_entity,
+        DEFAULT_CONFIG.solar_forecast_entity,
+    )
+
+
+@pytest.fixture(scope="session")
+def load_mock_data(training_mock_data: MockData) -> MockData:
+    """Training data for the load model only."""
+    return _subset(
+        training_mock_data,
+        DEFAULT_CONFIG.load_power_entity,
+        DEFAULT_CONFIG.outdoor_temp_entity,
+    )
+
+
+@pytest.fixture(scope="session")
+def decision_mock_data(training_mock_data: MockData) -> MockData:
+    """Training data for the decision model only."""
+    return _subset(
+        training_mock_data,
+        DEFAULT_CONFIG.battery_level_entity,
+        DEFAULT_CONFIG.nordpool_entity,
+        DEFAULT_CONFIG.solar_power_entity,
+        DEFAULT_CONFIG.load_power_entity,
+    )
+
+
 class TestAITrainer:
     """Test AI training orchestrator."""
 
     @pytest.fixture
-    def mock_hass(self) -> MagicMock:
-        """Create mock Home Assistant."""
-        hass = MagicMock()
-        hass.config.path = MagicMock(return_value="/tmp/hass")
-        hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
-        return hass
+    def mock_hass(self, tmp_path: Path) -> SimpleNamespace:
+        """Create mock Home Assistant with a per-test config directory."""
+        # Per-test directory so parallel workers never share saved models
+        return _mock_hass(tmp_path)
 
     @pytest.fixture
+    def mock_hass_tracked(self, mock_hass: SimpleNamespace) -> SimpleNamespace:
+        """Mock Home Assistant whose ``config.path`` records its calls."""
+        mock_hass.config.path = MagicMock(wraps=mock_hass.config.path)
+        return mock_hass
+
+    @pytest.fixture(scope="module")
     def config(self) -> AIConfig:
-        """Create test config."""
-        return AIConfig()
+        """Create test config with small models so the real fits stay fast (read-only)."""
+        return AIConfig(
+            solar_model_estimators=10, solar_model_max_depth=3, load_model_estimators=10
+        )
 
     @pytest.fixture
-    def trainer(self, mock_hass: MagicMock, config: AIConfig) -> AITrainer:
+    def trainer(self, mock_hass: SimpleNamespace, config: AIConfig) -> AITrainer:
         """Create trainer instance."""
         return AITrainer(mock_hass, config)
 
-    def test_init(self, trainer: AITrainer) -> None:
+    @pytest.fixture(scope="module")
+    def ro_trainer(self, tmp_path_factory: pytest.TempPathFactory, config: AIConfig) -> AITrainer:
+        """Create one trainer per module for tests that never train, save or load."""
+        return AITrainer(_mock_hass(tmp_path_factory.mktemp("models")), config)
+
+    def test_init(self, ro_trainer: AITrainer) -> None:
         """Test trainer initialization."""
-        assert trainer.hass is not None
-        assert trainer.config is not None
-        assert trainer.is_training is False
-        assert trainer.solar_predictor is None
-        assert trainer.load_forecaster is None
-        assert trainer.decision_optimizer is None
-
-    def test_get_model_path(self, trainer: AITrainer) -> None:
+        assert ro_trainer.hass is not None
+        assert ro_trainer.config is not None
+        assert ro_trainer.is_training is False
+        assert ro_trainer.solar_predictor is None
+        assert ro_trainer.load_forecaster is None
+        assert ro_trainer.decision_optimizer is None
+
+    def test_get_model_path(self, mock_hass_tracked: SimpleNamespace, config: AIConfig) -> None:
         """Test model path generation."""
+        trainer = AITrainer(mock_hass_tracked, config)
+
         # The path method is called with the subdirectory path
         # and returns the full path. We just verify it's a Path.
         path = trainer.get_model_path()
@@ -52,7 +165,6 @@ class TestAITrainer:
         assert "battery_energy_trading" in call_args
         assert "models" in call_args
 
-    @pytest.mark.asyncio
     async def test_train_all_models_insufficient_data(self, trainer: AITrainer) -> None:
         """Test training fails with insufficient data."""
         with patch.object(
@@ -65,7 +177,6 @@ class TestAITrainer:
             assert result["success"] is False
             assert "insufficient" in result["error"].lower()
 
-    @pytest.mark.asyncio
     async def test_train_all_models_already_training(self, trainer: AITrainer) -> None:
         """Test training returns error if already in progress."""
         trainer._is_training = True
@@ -73,49 +184,24 @@ class TestAITrainer:
         assert result["success"] is False
         assert "already in progress" in result["error"].lower()
 
-    @pytest.mark.asyncio
-    async def test_train_all_models_success(self, trainer: AITrainer) -> None:
+    async def test_train_all_models_success(
+        self, trainer: AITrainer, training_mock_data: MockData
+    ) -> None:
         """Test successful training flow."""
-        # Create mock data with sufficient samples
-        mock_data = {
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000 + h * 100} for h in range(24)
-            ]
-            * 10,  # 240 samples
-            trainer.config.solar_forecast_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 900 + h * 90} for h in range(24)
-            ]
-            * 10,
-            trainer.config.load_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 2000 + h * 50} for h in range(24)
-            ]
-            * 10,
-            trainer.config.outdoor_temp_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 15.0} for h in range(24)
-            ]
-            * 10,
-            trainer.config.battery_level_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 50.0} for h in range(24)
-            ]
-            * 10,
-            trainer.config.nordpool_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 0.10 + h * 0.01} for h in range(24)
-            ]
-            * 10,
-        }
-
         with (
             patch.object(
                 trainer.data_extractor,
                 "extract_training_data",
                 new_callable=AsyncMock,
-                return_value=mock_data,
+                return_value=training_mock_data,
             ),
             patch.object(
                 trainer.data_extractor,
                 "has_sufficient_data",
                 return_value=True,
             ),
+            # Full collections between steps only matter for real memory use
+            patch("custom_components.battery_energy_trading.ai.training.trainer.gc.collect"),
         ):
             result = await trainer.train_all_models()
 
@@ -124,268 +210,161 @@ class TestAITrainer:
             assert "duration_seconds" in result
             assert trainer.is_training is False
 
-    @pytest.mark.asyncio
-    async def test_train_solar_model(self, trainer: AITrainer) -> None:
+    async def test_train_solar_model(self, trainer: AITrainer, solar_mock_data: MockData) -> None:
         """Test solar model training."""
-        mock_data = {
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000 + h * 100} for h in range(24)
-            ]
-            * 10,
-            trainer.config.solar_forecast_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 900 + h * 90} for h in range(24)
-            ]
-            * 10,
-        }
-
-        result = await trainer._train_solar_model(mock_data)
+        result = await trainer._train_solar_model(solar_mock_data)
         assert result["trained"] is True
         assert "metrics" in result
         assert trainer.solar_predictor is not None
         assert trainer.solar_predictor.is_trained is True
 
-    @pytest.mark.asyncio
     async def test_train_solar_model_insufficient_data(self, trainer: AITrainer) -> None:
         """Test solar model training with insufficient data."""
         mock_data = {
-            trainer.config.solar_power_entity: [{"start": "2024-01-01T12:00:00", "mean": 1000}],
-            trainer.config.solar_forecast_entity: [{"start": "2024-01-01T12:00:00", "mean": 900}],
+            trainer.config.solar_power_entity: SOLAR_SAMPLES[12:13],
+            trainer.config.solar_forecast_entity: FORECAST_SAMPLES[12:13],
         }
 
         result = await trainer._train_solar_model(mock_data)
         assert result["trained"] is False
         assert "error" in result
 
-    @pytest.mark.asyncio
-    async def test_train_load_model(self, trainer: AITrainer) -> None:
+    async def test_train_load_model(self, trainer: AITrainer, load_mock_data: MockData) -> None:
         """Test load model training."""
-        mock_data = {
-            trainer.config.load_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 2000 + h * 50} for h in range(24)
-            ]
-            * 10,
-            trainer.config.outdoor_temp_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 15.0} for h in range(24)
-            ]
-            * 10,
-        }
-
-        result = await trainer._train_load_model(mock_data)
+        result = await trainer._train_load_model(load_mock_data)
         assert result["trained"] is True
         assert "metrics" in result
         assert trainer.load_forecaster is not None
         assert trainer.load_forecaster.is_trained is True
 
-    @pytest.mark.asyncio
     async def test_train_load_model_insufficient_data(self, trainer: AITrainer) -> None:
         """Test load model training with insufficient data."""
         mock_data = {
-            trainer.config.load_power_entity: [{"start": "2024-01-01T12:00:00", "mean": 2000}],
+            trainer.config.load_power_entity: LOAD_SAMPLES[12:13],
         }
 
         result = await trainer._train_load_model(mock_data)
         assert result["trained"] is False
         assert "error" in result
 
-    @pytest.mark.asyncio
-    async def test_train_decision_model(self, trainer: AITrainer) -> None:
+    async def test_train_decision_model(
+        self, trainer: AITrainer, decision_mock_data: MockData
+    ) -> None:
         """Test decision model training."""
-        mock_data = {
-            trainer.config.battery_level_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 50.0 + h} for h in range(24)
-            ]
-            * 10,
-            trainer.config.nordpool_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 0.10 + h * 0.01} for h in range(24)
-            ]
-            * 10,
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000} for h in range(24)
-            ]
-            * 10,
-            trainer.config.load_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 2000} for h in range(24)
-            ]
-            * 10,
-        }
-
-        result = await trainer._train_decision_model(mock_data)
+        result = await trainer._train_decision_model(decision_mock_data)
         assert result["trained"] is True
         assert "metrics" in result
         assert trainer.decision_optimizer is not None
 
-    @pytest.mark.asyncio
     async def test_train_decision_model_insufficient_data(self, trainer: AITrainer) -> None:
         """Test decision model training with insufficient data."""
         mock_data = {
-            trainer.config.battery_level_entity: [{"start": "2024-01-01T12:00:00", "mean": 50.0}],
+            trainer.config.battery_level_entity: BATTERY_SAMPLES[12:13],
         }
 
         result = await trainer._train_decision_model(mock_data)
         assert result["trained"] is False
         assert "error" in result
 
-    def test_prepare_solar_data(self, trainer: AITrainer) -> None:
+    def test_prepare_solar_data(self, ro_trainer: AITrainer) -> None:
         """Test solar data preparation."""
         mock_data = {
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-06-15T{h:02d}:00:00", "mean": 1000 + h * 100} for h in range(24)
-            ],
-            trainer.config.solar_forecast_entity: [
-                {"start": f"2024-06-15T{h:02d}:00:00", "mean": 900 + h * 90} for h in range(24)
-            ],
+            ro_trainer.config.solar_power_entity: JUNE_SOLAR_SAMPLES,
+            ro_trainer.config.solar_forecast_entity: JUNE_FORECAST_SAMPLES,
         }
 
-        X, y = trainer._prepare_solar_data(mock_data)
+        X, y = ro_trainer._prepare_solar_data(mock_data)
         assert len(X) > 0
         assert len(y) > 0
         assert X.shape[0] == y.shape[0]
 
-    def test_prepare_solar_data_missing_entities(self, trainer: AITrainer) -> None:
+    def test_prepare_solar_data_missing_entities(self, ro_trainer: AITrainer) -> None:
         """Test solar data preparation with missing entities."""
         mock_data = {}
 
-        X, y = trainer._prepare_solar_data(mock_data)
+        X, y = ro_trainer._prepare_solar_data(mock_data)
         assert len(X) == 0
         assert len(y) == 0
 
-    def test_prepare_load_data(self, trainer: AITrainer) -> None:
+    def test_prepare_load_data(self, ro_trainer: AITrainer) -> None:
         """Test load data preparation."""
         mock_data = {
-            trainer.config.load_power_entity: [
-                {"start": f"2024-06-15T{h:02d}:00:00", "mean": 2000 + h * 50} for h in range(24)
-            ],
-            trainer.config.outdoor_temp_entity: [
-                {"start": f"2024-06-15T{h:02d}:00:00", "mean": 15.0 + h * 0.5} for h in range(24)
-            ],
+            ro_trainer.config.load_power_entity: JUNE_LOAD_SAMPLES,
+            ro_trainer.config.outdoor_temp_entity: JUNE_TEMP_SAMPLES,
         }
 
-        X, y = trainer._prepare_load_data(mock_data)
+        X, y = ro_trainer._prepare_load_data(mock_data)
         assert len(X) == 24
         assert len(y) == 24
         assert X.shape[1] == 5  # hour, day_of_week, month, is_weekend, temp
 
-    def test_prepare_load_data_missing_temp(self, trainer: AITrainer) -> None:
+    def test_prepare_load_data_missing_temp(self, ro_trainer: AITrainer) -> None:
         """Test load data preparation without temperature."""
         mock_data = {
-            trainer.config.load_power_entity: [
-                {"start": f"2024-06-15T{h:02d}:00:00", "mean": 2000 + h * 50} for h in range(24)
-            ],
+            ro_trainer.config.load_power_entity: JUNE_LOAD_SAMPLES,
         }
 
-        X, y = trainer._prepare_load_data(mock_data)
+        X, y = ro_trainer._prepare_load_data(mock_data)
         assert len(X) == 24
         # Temperature defaults to 15
 
-    def test_prepare_decision_experiences(self, trainer: AITrainer) -> None:
+    def test_prepare_decision_experiences(self, ro_trainer: AITrainer) -> None:
         """Test decision experience preparation."""
         mock_data = {
-            trainer.config.battery_level_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 50.0 + h} for h in range(24)
-            ],
-            trainer.config.nordpool_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 0.10 + h * 0.01} for h in range(24)
-            ],
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000} for h in range(24)
-            ],
-            trainer.config.load_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 2000} for h in range(24)
-            ],
+            ro_trainer.config.battery_level_entity: BATTERY_SAMPLES,
+            ro_trainer.config.nordpool_entity: PRICE_SAMPLES,
+            ro_trainer.config.solar_power_entity: SOLAR_SAMPLES,
+            ro_trainer.config.load_power_entity: LOAD_SAMPLES,
         }
 
-        experiences = trainer._prepare_decision_experiences(mock_data)
+        experiences = ro_trainer._prepare_decision_experiences(mock_data)
         # Should return list of experiences (can be empty if not enough data)
         assert isinstance(experiences, list)
 
-    @pytest.mark.asyncio
-    async def test_save_models(self, trainer: AITrainer) -> None:
+    async def test_save_models(
+        self, trainer: AITrainer, solar_mock_data: MockData, tmp_path: Path
+    ) -> None:
         """Test model saving."""
         # Train models first
-        mock_data = {
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000 + h * 100} for h in range(24)
-            ]
-            * 10,
-            trainer.config.solar_forecast_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 900 + h * 90} for h in range(24)
-            ]
-            * 10,
-        }
+        await trainer._train_solar_model(solar_mock_data)
 
-        await trainer._train_solar_model(mock_data)
+        await trainer._save_models()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            trainer.hass.config.path = MagicMock(return_value=tmpdir)
+        # Model path is the per-test tmp_path (see mock_hass)
+        assert [p.name for p in tmp_path.iterdir()] == ["solar_predictor.pkl"]
 
-            # Should not raise
-            await trainer._save_models()
-
-    @pytest.mark.asyncio
     async def test_load_models_no_models(self, trainer: AITrainer) -> None:
         """Test loading models when none exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            trainer.hass.config.path = MagicMock(return_value=tmpdir)
-
-            result = await trainer.load_models()
-            assert result is False
+        result = await trainer.load_models()
+        assert result is False
 
-    @pytest.mark.asyncio
-    async def test_load_models_success(self, trainer: AITrainer) -> None:
+    async def test_load_models_success(
+        self, trainer: AITrainer, training_mock_data: MockData
+    ) -> None:
         """Test successful model loading."""
         # First train and save all models
-        mock_data = {
-            trainer.config.solar_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 1000 + h * 100} for h in range(24)
-            ]
-            * 10,
-            trainer.config.solar_forecast_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 900 + h * 90} for h in range(24)
-            ]
-            * 10,
-            trainer.config.load_power_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 2000 + h * 50} for h in range(24)
-            ]
-            * 10,
-            trainer.config.outdoor_temp_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 15.0} for h in range(24)
-            ]
-            * 10,
-            trainer.config.battery_level_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 50.0 + h} for h in range(24)
-            ]
-            * 10,
-            trainer.config.nordpool_entity: [
-                {"start": f"2024-01-01T{h:02d}:00:00", "mean": 0.10 + h * 0.01} for h in range(24)
-            ]
-            * 10,
-        }
-
-        await trainer._train_solar_model(mock_data)
-        await trainer._train_load_model(mock_data)
-        await trainer._train_decision_model(mock_data)
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            trainer.hass.config.path = MagicMock(return_value=tmpdir)
+        await trainer._train_solar_model(training_mock_data)
+        await trainer._train_load_model(training_mock_data)
+        await trainer._train_decision_model(training_mock_data)
 
-            await trainer._save_models()
+        await trainer._save_models()
 
-            # Clear models
-            trainer.solar_predictor = None
-            trainer.load_forecaster = None
-            trainer.decision_optimizer = None
+        # Clear models
+        trainer.solar_predictor = None
+        trainer.load_forecaster = None
+        trainer.decision_optimizer = None
 
-            # Load them back
-            result = await trainer.load_models()
-            assert result is True
-            assert trainer.solar_predictor is not None
-            assert trainer.load_forecaster is not None
-            assert trainer.decision_optimizer is not None
+        # Load them back from the same directory
+        result = await trainer.load_models()
+        assert result is True
+        assert trainer.solar_predictor is not None
+        assert trainer.load_forecaster is not None
+        assert trainer.decision_optimizer is not None
 
-    def test_last_training_property(self, trainer: AITrainer) -> None:
+    def test_last_training_property(self, ro_trainer: AITrainer) -> None:
         """Test last_training property."""
-        assert trainer.last_training is None
+        assert ro_trainer.last_training is None
 
-    def test_training_metrics_property(self, trainer: AITrainer) -> None:
+    def test_training_metrics_property(self, ro_trainer: AITrainer) -> None:
         """Test training_metrics property."""
-        assert trainer.training_metrics == {}
+        assert ro_trainer.training_metrics == {}